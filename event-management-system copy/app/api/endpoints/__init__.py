@@ -9,6 +9,7 @@ from app.api.endpoints.registrations import router as registrations_router
 from app.api.endpoints.tickets import router as tickets_router
 from app.api.endpoints.admin import router as admin_router
 from app.api.endpoints.orders import router as orders_router
+from app.api.endpoints.admission import router as admission_router
 
 # Expose routers with aliases to avoid naming conflicts
 auth = auth_router
@@ -19,5 +20,6 @@ registrations = registrations_router
 tickets = tickets_router
 admin = admin_router
 orders = orders_router
+admission = admission_router
 
 # This file is intentionally empty to make the directory a Python package 
\ No newline at end of file
@@ -1,18 +1,82 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 
-from app.database import get_db
+from app.core.admission import admission_queue
+from app.core.logging_setup import logging_stats
+from app.core.response_cache import response_cache
+from app.db.base import get_db
+from app.db.checkins import checkin_buffer
+from app.db.invalidation import invalidation_listener
+from app.db.stats import STATS_ROW_ID
+from app.models.stats import SiteStats
+from app.schemas.user import UserResponse
+from app.core.security import get_current_admin_user, hashing_pool, token_cache, user_cache
 
 router = APIRouter()
 
 @router.get("/stats", status_code=status.HTTP_200_OK)
-def get_stats():
+async def get_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user)
+):
     """
-    Get system statistics.
+    Get system statistics (admin only).
+    
+    Reads the single pre-aggregated site_stats row maintained by the writers.
     """
+    stats = (await db.execute(select(SiteStats).where(SiteStats.id == STATS_ROW_ID))).scalar_one_or_none()
+    if stats is None:
+        stats = SiteStats(reconciled_at=None)
     return {
-        "total_users": 0,
-        "total_events": 0,
-        "total_registrations": 0,
-        "upcoming_events": 0
+        "total_users": stats.total_users or 0,
+        "active_users": stats.active_users or 0,
+        "pending_users": stats.pending_users or 0,
+        "total_events": stats.total_events or 0,
+        "upcoming_events": stats.upcoming_events or 0,
+        "total_registrations": stats.total_registrations or 0,
+        "total_orders": stats.total_orders or 0,
+        "tickets_sold": stats.tickets_sold or 0,
+        "total_revenue": stats.total_revenue or 0.0,
+        "reconciled_at": stats.reconciled_at
     }
+
+@router.get("/cache-stats", status_code=status.HTTP_200_OK)
+def get_cache_stats(current_user: UserResponse = Depends(get_current_admin_user)):
+    """
+    Get hit/miss counters of the in-process caches (admin only).
+    """
+    return {
+        "auth_tokens": token_cache.stats(),
+        "auth_users": user_cache.stats(),
+        "responses": response_cache.stats(),
+        "invalidations": invalidation_listener.stats(),
+    }
+
+@router.get("/hashing-stats", status_code=status.HTTP_200_OK)
+def get_hashing_stats(current_user: UserResponse = Depends(get_current_admin_user)):
+    """
+    Get queue depth and throughput of the password hashing pool (admin only).
+    """
+    return hashing_pool.stats()
+
+@router.get("/queue-stats", status_code=status.HTTP_200_OK)
+async def get_queue_stats(db: AsyncSession = Depends(get_db), current_user: UserResponse = Depends(get_current_admin_user)):
+    """
+    Get waiting and admitted buyers of the flash-sale admission queues (admin only).
+    """
+    return await admission_queue.stats(db)
+
+@router.get("/checkin-stats", status_code=status.HTTP_200_OK)
+def get_checkin_stats(current_user: UserResponse = Depends(get_current_admin_user)):
+    """
+    Get queue depth and flush latency of the check-in buffer (admin only).
+    """
+    return checkin_buffer.stats()
+
+@router.get("/logging-stats", status_code=status.HTTP_200_OK)
+def get_logging_stats(current_user: UserResponse = Depends(get_current_admin_user)):
+    """
+    Get the log level and the records dropped by the background log writer (admin only).
+    """
+    return logging_stats()
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.db.base import get_db
+from app.db.retry import run_with_retry
+from app.models.event import Event
+from app.schemas.user import UserResponse
+from app.core.admission import AdmissionQueueFull, admission_queue
+from app.core.security import get_current_active_user
+
+router = APIRouter()
+
+@router.post("/events/{event_id}", status_code=status.HTTP_201_CREATED)
+async def join_queue(
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Join the admission queue of a flash-sale event.
+    
+    Returns a token to poll GET /api/queue/{token} with and to send as
+    queueToken when checking out once it has been admitted.
+    """
+    row = (await db.execute(select(Event.admission_rate).where(Event.id == event_id))).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if not row.admission_rate:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event does not use an admission queue"
+        )
+    
+    async def enqueue():
+        try:
+            ticket = await admission_queue.join(db, event_id, current_user.id, row.admission_rate)
+        except AdmissionQueueFull:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="The queue for this event is full, please try again shortly",
+                headers={"Retry-After": "5"},
+            )
+        except IntegrityError:
+            # The same buyer joined concurrently: hand out the ticket that won
+            await db.rollback()
+            ticket = await admission_queue.join(db, event_id, current_user.id, row.admission_rate)
+        await db.commit()
+        return {"token": ticket.token, **admission_queue.describe(ticket, row.admission_rate)}
+    
+    return await run_with_retry(db, enqueue)
+
+@router.get("/{token}")
+async def get_queue_status(token: str, db: AsyncSession = Depends(get_db)):
+    """
+    Get the position and admission state of a queue token.
+    
+    A single indexed lookup, so waiting buyers can poll it cheaply.
+    """
+    state = await admission_queue.status(db, token)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Queue token not found or expired")
+    return state
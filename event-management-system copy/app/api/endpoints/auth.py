@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 from datetime import timedelta
 
 from app.db.base import get_db
+from app.db.stats import adjust_stats, user_status_deltas
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.token import Token
@@ -20,9 +21,9 @@ from sqlalchemy import select
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     # Check if user with given email already exists
-    db_user = db.execute(select(User).where(User.email == user.email)).scalar_one_or_none()
+    db_user = (await db.execute(select(User).where(User.email == user.email))).scalar_one_or_none()
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -30,7 +31,7 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     db_user = User(
         email=user.email,
         name=user.name,
@@ -38,16 +39,18 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         role=user.role
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.flush()
+    await adjust_stats(db, **user_status_deltas(bool(db_user.is_active)))
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,45 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from sqlalchemy import select
 
 from app.db.base import get_db
-from app.models.user import User
+from app.db.invalidation import Invalidation, publish_invalidations
+from app.db.versions import bump_table_versions, get_table_versions
+from app.schemas.user import UserResponse
 from app.models.category import Category
 from app.models.event import Event
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.core.conditional import etag, is_not_modified, not_modified, representation_tag, validators
+from app.core.response_cache import cache_response, cached_response, params_key
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset
 from app.core.security import get_current_admin_user
 
 # Create the router (named exactly like the module for easier import)
 router = APIRouter()
 
+# Sort keys accepted by category listings (prefix with "-" for descending)
+CATEGORY_SORT_FIELDS = {
+    "name": Category.name,
+    "id": Category.id,
+}
+
+CATEGORY_REPRESENTATION = representation_tag(CategoryResponse)
+CATEGORY_LIST_ADAPTER = TypeAdapter(List[CategoryResponse])
+CATEGORY_ADAPTER = TypeAdapter(CategoryResponse)
+
+async def categories_validators(db: AsyncSession):
+    """ETag and Last-Modified of category responses, from the categories table version."""
+    version, updated_at = (await get_table_versions(db, "categories"))["categories"]
+    return etag("categories", CATEGORY_REPRESENTATION, version), updated_at
+
 @router.get("", response_model=List[CategoryResponse])
-def get_categories(
-    db: Session = Depends(get_db),
+async def get_categories(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    categories = db.execute(select(Category).offset(skip).limit(limit)).scalars().all()
-    return categories
+    page = keyset(sort, cursor, CATEGORY_SORT_FIELDS, Category.id)
+    
+    # Any category write changes the tag; a match is answered without querying
+    tag, last_modified = await categories_validators(db)
+    if is_not_modified(request, tag, last_modified):
+        return not_modified(tag, last_modified)
+    
+    key = ("categories", params_key(
+        sort=page.sort,
+        cursor=tuple(page.after) if page.after else None,
+        skip=skip if cursor is None and skip else None,
+        limit=limit
+    ), tag)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    query = page.apply(select(Category))
+    if cursor is None and skip:
+        query = query.offset(skip)
+    categories = (await db.execute(query.limit(limit))).scalars().all()
+    
+    headers = validators(tag, last_modified)
+    next_cursor = page.next_cursor(categories, limit)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return cache_response(key, CATEGORY_LIST_ADAPTER, categories, headers)
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(
+async def get_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
-    category = db.execute(select(Category).where(Category.id == category_id)).scalar_one_or_none()
+    tag, last_modified = await categories_validators(db)
+    if is_not_modified(request, tag, last_modified):
+        return not_modified(tag, last_modified)
+    
+    key = ("category", category_id, tag)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    category = (await db.execute(select(Category).where(Category.id == category_id))).scalar_one_or_none()
     if category is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    return category
+    return cache_response(key, CATEGORY_ADAPTER, category, validators(tag, last_modified))
 
 @router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user)
 ):
     # Check if category with given name already exists
-    db_category = db.execute(select(Category).where(Category.name == category.name)).scalar_one_or_none()
+    db_category = (await db.execute(select(Category).where(Category.name == category.name))).scalar_one_or_none()
     if db_category:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -49,19 +108,21 @@ def create_category(
     # Create new category
     db_category = Category(**category.model_dump())
     db.add(db_category)
-    db.commit()
-    db.refresh(db_category)
+    await bump_table_versions(db, "categories")
+    await publish_invalidations(db, Invalidation("responses", "categories"))
+    await db.commit()
+    await db.refresh(db_category)
     return db_category
 
 @router.put("/{category_id}", response_model=CategoryResponse)
-def update_category(
+async def update_category(
     category_id: int,
     category_update: CategoryUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user)
 ):
     # Get category
-    db_category = db.execute(select(Category).where(Category.id == category_id)).scalar_one_or_none()
+    db_category = (await db.execute(select(Category).where(Category.id == category_id))).scalar_one_or_none()
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
     
@@ -71,25 +132,32 @@ def update_category(
         if value is not None:
             setattr(db_category, key, value)
     
-    db.commit()
-    db.refresh(db_category)
+    # The category's responses also cover the event details embedding it
+    await bump_table_versions(db, "categories")
+    await publish_invalidations(
+        db,
+        Invalidation("responses", "categories"),
+        Invalidation("responses", "category", category_id)
+    )
+    await db.commit()
+    await db.refresh(db_category)
     return db_category
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(
+async def delete_category(
     category_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user)
 ):
     # Get category
-    db_category = db.execute(select(Category).where(Category.id == category_id)).scalar_one_or_none()
+    db_category = (await db.execute(select(Category).where(Category.id == category_id))).scalar_one_or_none()
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
     
     # Check if category is used in events
-    events_count = db.execute(
-        select(Event).where(Event.category_id == category_id)
-    ).scalar_one_or_none()
+    events_count = (await db.execute(
+        select(Event.id).where(Event.category_id == category_id).limit(1)
+    )).scalar_one_or_none()
     if events_count:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,6 +165,12 @@ def delete_category(
         )
     
     # Delete category
-    db.delete(db_category)
-    db.commit()
+    await db.delete(db_category)
+    await bump_table_versions(db, "categories")
+    await publish_invalidations(
+        db,
+        Invalidation("responses", "categories"),
+        Invalidation("responses", "category", category_id)
+    )
+    await db.commit()
     return None
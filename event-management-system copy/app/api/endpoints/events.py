@@ -1,24 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List, Optional
-from datetime import datetime
-from sqlalchemy import select
+from datetime import date, datetime, timedelta
+from sqlalchemy import Integer, case, cast, false, func, literal, null, select, true, union_all
+import hashlib
+import logging
 
 from app.db.base import get_db
-from app.models.user import User
+from app.db.stats import adjust_stats, is_upcoming
+from app.db.search import build_match_query, events_fts, match_events, search_rank
+from app.db.invalidation import Invalidation, publish_invalidations
+from app.db.versions import bump_table_versions, get_table_versions
+from app.schemas.category import CategoryResponse
+from app.schemas.user import UserResponse
 from app.models.category import Category
+from app.models.user import User
 from app.models.event import Event
-from app.models.registration import Registration
-from app.schemas.event import EventCreate, EventUpdate, EventResponse, EventDetailResponse
+from app.schemas.event import (
+    EventBatchRequest,
+    EventBatchResponse,
+    EventCreate,
+    EventDetailResponse,
+    EventFacetsResponse,
+    EventResponse,
+    EventUpdate,
+)
+from app.core.conditional import etag, is_not_modified, latest, not_modified, representation_tag, validators
+from app.core.export import export_format, stream_export
+from app.core.response_cache import cache_response, cached_response, params_key
+from app.core.serialization import records, sparse_list_adapter
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset
 from app.core.security import get_current_active_user, get_current_event_manager_user
 
 router = APIRouter()
 
-@router.get("/", response_model=List[EventResponse])
-def get_events(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+logger = logging.getLogger(__name__)
+
+# Sort keys accepted by event listings (prefix with "-" for descending)
+EVENT_SORT_FIELDS = {
+    "start_date": Event.start_date,
+    "price": Event.price,
+    "title": Event.title,
+    "id": Event.id,
+}
+
+# Fields a listing can be reduced to with ?fields=, all of them by default
+EVENT_LIST_FIELDS = tuple(EventResponse.model_fields)
+
+# Related objects a listing can embed with ?include=, joined into the same
+# query: (table, join condition, response schema)
+EVENT_INCLUDES = {
+    "category": (Category, Event.category_id == Category.id, CategoryResponse),
+    "organizer": (User, Event.organizer_id == User.id, UserResponse),
+}
+
+EVENT_LIST_REPRESENTATION = representation_tag(EventResponse, CategoryResponse, UserResponse)
+EVENT_DETAIL_REPRESENTATION = representation_tag(EventDetailResponse)
+EVENT_DETAIL_ADAPTER = TypeAdapter(EventDetailResponse)
+EVENT_BATCH_REPRESENTATION = representation_tag(EventBatchResponse)
+EVENT_BATCH_ADAPTER = TypeAdapter(EventBatchResponse)
+
+# Most events one batch request may ask for
+EVENT_BATCH_MAX_IDS = 100
+
+EVENT_FACETS_REPRESENTATION = representation_tag(EventFacetsResponse)
+EVENT_FACETS_ADAPTER = TypeAdapter(EventFacetsResponse)
+
+# Columns of an event export, in order
+EVENT_EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "start_date",
+    "end_date",
+    "location",
+    "capacity",
+    "price",
+    "is_published",
+    "category_id",
+    "organizer_id",
+    "attendee_count",
+    "tickets_sold",
+)
+
+# Number of equal-width price histogram buckets, and of weeks counted ahead
+FACET_PRICE_BUCKETS = 10
+FACET_WEEKS = 12
+
+def _parse_list(value: Optional[str], allowed, name: str) -> List[str]:
+    # Comma-separated names, kept in the order of ``allowed``
+    requested = {item.strip() for item in value.split(",") if item.strip()}
+    if not requested or not requested <= set(allowed):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {name}. Allowed: {', '.join(allowed)}"
+        )
+    return [item for item in allowed if item in requested]
+
+def _nest(record: dict, name: str, schema) -> Optional[dict]:
+    # Move the prefixed columns of an included object into a dict of its own
+    nested = {field: record.pop(f"{name}__{field}") for field in schema.model_fields}
+    return nested if nested["id"] is not None else None
+
+def apply_event_filters(
+    query,
     category_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -27,10 +113,13 @@ def get_events(
     organizer_id: Optional[int] = None,
     search: Optional[str] = None
 ):
-    # Base query
-    query = select(Event)
+    """
+    Apply the event listing filters to a query.
     
-    # Apply filters
+    Every combination is served by one of the indexes declared on Event, except
+    that a range filter cannot also give the order of another sort column;
+    check_query_plans.py verifies the plans and lists the allowed scans.
+    """
     if category_id:
         query = query.where(Event.category_id == category_id)
     if start_date:
@@ -44,48 +133,427 @@ def get_events(
     if organizer_id:
         query = query.where(Event.organizer_id == organizer_id)
     if search:
-        query = query.where(Event.title.like(f"%{search}%") | Event.description.like(f"%{search}%") | Event.location.like(f"%{search}%"))
+        match_query = build_match_query(search)
+        if match_query is None:
+            return query.where(false())
+        query = query.where(Event.id.in_(select(events_fts.c.rowid).where(match_events(match_query))))
+    return query
+
+@router.get("/", response_model=List[EventResponse])
+async def get_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    category_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    organizer_id: Optional[int] = None,
+    search: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None
+):
+    """
+    List events. ``fields`` (e.g. ``id,title,start_date``) limits the columns
+    read and returned; ``include`` (``category``, ``organizer``) embeds those
+    objects, joined into the same query.
+    """
+    # Parse sort order, resume position and projection before touching the database
+    page = keyset(sort, cursor, EVENT_SORT_FIELDS, Event.id)
+    selected = EVENT_LIST_FIELDS if fields is None else tuple(_parse_list(fields, EVENT_LIST_FIELDS, "fields"))
+    includes = [] if include is None else _parse_list(include, list(EVENT_INCLUDES), "include")
+    
+    # Listings change only when an event (or an included object) is written;
+    # a client holding the current versions gets a 304 without any query
+    tables = ["events"] + [EVENT_INCLUDES[name][0].__tablename__ for name in includes]
+    versions = await get_table_versions(db, *tables)
+    tag = etag("events", EVENT_LIST_REPRESENTATION, *(versions[table][0] for table in tables))
+    last_modified = latest(versions[table][1] for table in tables)
+    if is_not_modified(request, tag, last_modified):
+        return not_modified(tag, last_modified)
+    
+    # The same listing at the same version is served from the response cache,
+    # keyed by the parsed parameters so that junk in the query string is ignored
+    key = ("events", params_key(
+        sort=page.sort,
+        cursor=tuple(page.after) if page.after else None,
+        skip=skip if cursor is None and skip else None,
+        limit=limit,
+        category_id=category_id,
+        start_date=start_date,
+        end_date=end_date,
+        price_min=price_min,
+        price_max=price_max,
+        organizer_id=organizer_id,
+        search=search,
+        fields=None if fields is None else selected,
+        include=tuple(includes) or None
+    ), tag)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    # Base query: the requested columns, plus those the page cursor is built from
+    needed = set(selected) | {page.column.key, page.id_column.key}
+    query = select(*(Event.__table__.c[name] for name in EVENT_LIST_FIELDS if name in needed))
+    for name in includes:
+        table, condition, schema = EVENT_INCLUDES[name]
+        query = query.outerjoin(table, condition).add_columns(
+            *(getattr(table, field).label(f"{name}__{field}") for field in schema.model_fields)
+        )
+    
+    # Apply filters
+    query = apply_event_filters(
+        query,
+        category_id=category_id,
+        start_date=start_date,
+        end_date=end_date,
+        price_min=price_min,
+        price_max=price_max,
+        organizer_id=organizer_id,
+        search=search
+    )
     
-    # Pagination
-    query = query.offset(skip).limit(limit)
+    # Pagination (keyset when a cursor is given, offset kept for older clients)
+    query = page.apply(query)
+    if cursor is None and skip:
+        query = query.offset(skip)
+    query = query.limit(limit)
     
     # Execute query
-    events = db.execute(query).scalars().all()
+    result = await db.execute(query)
+    events = result.all()
+    
+    headers = validators(tag, last_modified)
+    next_cursor = page.next_cursor(events, limit)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    content = records(result.keys(), events)
+    for record in content:
+        for name in includes:
+            record[name] = _nest(record, name, EVENT_INCLUDES[name][2])
+    # Listings embedding categories are dropped from the cache when one of them changes
+    related = {("category", record["category"]["id"]) for record in content if record.get("category")}
+    adapter = sparse_list_adapter(
+        EventResponse,
+        selected,
+        tuple((name, EVENT_INCLUDES[name][2]) for name in includes)
+    )
+    return cache_response(key, adapter, content, headers, related, from_attributes=False)
+
+@router.get("/search", response_model=List[EventResponse])
+async def search_events(
+    q: str,
+    db: AsyncSession = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100
+):
+    """
+    Full-text search over event title, description and location, best match first.
+    """
+    match_query = build_match_query(q)
+    if match_query is None:
+        return []
+    
+    query = (
+        select(Event)
+        .join(events_fts, events_fts.c.rowid == Event.id)
+        .where(match_events(match_query))
+        .order_by(search_rank())
+        .offset(skip)
+        .limit(limit)
+    )
+    
+    events = (await db.execute(query)).scalars().all()
     return events
 
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+def facet_query(filters: dict, today: date):
+    """
+    Category counts, price bounds, the price histogram and per-week counts of
+    events from ``today`` on for the filtered events, as one statement.
+    
+    Each row is ``(facet, bucket, count, low, high)``: one ``total`` row with
+    the price bounds, then a row per category, histogram bucket and week.
+    """
+    filtered = apply_event_filters(
+        select(Event.category_id, Event.price, Event.start_date), **filters
+    ).cte("filtered")
+    bounds = select(
+        func.min(filtered.c.price).label("low"),
+        func.max(filtered.c.price).label("high")
+    ).cte("bounds")
+    
+    price_bucket = case(
+        (bounds.c.high == bounds.c.low, 0),
+        else_=func.min(
+            cast((filtered.c.price - bounds.c.low) * FACET_PRICE_BUCKETS / (bounds.c.high - bounds.c.low), Integer),
+            FACET_PRICE_BUCKETS - 1
+        )
+    )
+    # Monday of the event's week
+    week = func.date(filtered.c.start_date, "-6 days", "weekday 1")
+    day_start = datetime.combine(today, datetime.min.time())
+    week_from = datetime.combine(_week_start(today), datetime.min.time())
+    
+    return union_all(
+        select(literal("total"), null(), func.count(), func.min(filtered.c.price), func.max(filtered.c.price))
+        .select_from(filtered),
+        select(literal("category"), filtered.c.category_id, func.count(), null(), null())
+        .group_by(filtered.c.category_id),
+        select(literal("price"), price_bucket, func.count(), null(), null())
+        .select_from(filtered.join(bounds, true()))
+        .group_by(price_bucket),
+        select(literal("week"), week, func.count(), null(), null())
+        .where(
+            filtered.c.start_date >= day_start,
+            filtered.c.start_date < week_from + timedelta(weeks=FACET_WEEKS)
+        )
+        .group_by(week)
+    )
+
+@router.get("/facets", response_model=EventFacetsResponse)
+async def get_event_facets(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    category_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    organizer_id: Optional[int] = None,
+    search: Optional[str] = None
+):
+    """
+    Counts for the event filter panel, over the events matching the same
+    filters as the listing: events per category, the price range with a
+    histogram, and upcoming events per week for the next weeks.
+    """
+    filters = {
+        "category_id": category_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "price_min": price_min,
+        "price_max": price_max,
+        "organizer_id": organizer_id,
+        "search": search,
+    }
+    today = datetime.utcnow().date()
+    
+    # Facets change when an event is written, and the weekly counts each day
+    versions = await get_table_versions(db, "events")
+    tag = etag("facets", EVENT_FACETS_REPRESENTATION, versions["events"][0], today.isoformat())
+    last_modified = versions["events"][1]
+    if is_not_modified(request, tag, last_modified):
+        return not_modified(tag, last_modified)
+    
+    # Cached per filter signature, whatever else is in the query string
+    key = ("events", ("facets", *params_key(**filters)), tag)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    rows = (await db.execute(facet_query(filters, today))).all()
+    
+    total = 0
+    low = high = None
+    categories = []
+    buckets = [0] * FACET_PRICE_BUCKETS
+    weeks = {}
+    for facet, bucket, count, row_low, row_high in rows:
+        if facet == "total":
+            total, low, high = count, row_low, row_high
+        elif facet == "category":
+            categories.append({"category_id": bucket, "count": count})
+        elif facet == "price" and bucket is not None:
+            buckets[bucket] = count
+        elif facet == "week":
+            weeks[date.fromisoformat(bucket)] = count
+    
+    histogram = []
+    if total:
+        width = (high - low) / FACET_PRICE_BUCKETS
+        histogram = [
+            {"low": low + width * index, "high": low + width * (index + 1), "count": count}
+            for index, count in enumerate(buckets)
+        ]
+    upcoming_weeks = []
+    for index in range(FACET_WEEKS):
+        week_start = _week_start(today) + timedelta(weeks=index)
+        upcoming_weeks.append({"week_start": week_start, "count": weeks.get(week_start, 0)})
+    
+    content = {
+        "total": total,
+        "categories": sorted(categories, key=lambda item: -item["count"]),
+        "price": {"min": low, "max": high, "histogram": histogram},
+        "upcoming_weeks": upcoming_weeks
+    }
+    return cache_response(key, EVENT_FACETS_ADAPTER, content, validators(tag, last_modified), from_attributes=False)
+
+@router.get("/export")
+async def export_events(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user),
+    format: str = "csv"
+):
+    """
+    Download events with their attendee and ticket counts as CSV or NDJSON:
+    every event for admins, the events they organize for everyone else.
+    
+    Rows are streamed as they are read, so the export size is not limited by memory.
+    """
+    format = export_format(format)
+    query = select(*(Event.__table__.c[name] for name in EVENT_EXPORT_COLUMNS)).order_by(Event.id)
+    if current_user.role != "admin":
+        query = query.where(Event.organizer_id == current_user.id)
+    return stream_export(query, EVENT_EXPORT_COLUMNS, format, "events")
+
+async def get_event_batch(request: Request, db: AsyncSession, ids: List[int], conditional: bool):
+    """
+    Load the events with the given IDs, in the order requested, and report the
+    IDs that do not exist.
+    
+    Takes at most three queries whatever the number of IDs: the versions of the
+    requested events, the table versions (usually cached), and the events with
+    their categories and organizers.
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > EVENT_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many ids. At most {EVENT_BATCH_MAX_IDS} per request"
+        )
+    
+    # The tag covers each event's own version, so counter updates change it too
+    current = (await db.execute(
+        select(Event.id, Event.version, Event.updated_at).where(Event.id.in_(ids)).order_by(Event.id)
+    )).all()
+    versions = await get_table_versions(db, "categories", "users")
+    event_versions = hashlib.sha1(",".join(f"{row.id}:{row.version}" for row in current).encode()).hexdigest()[:12]
+    tag = etag(
+        "events",
+        EVENT_BATCH_REPRESENTATION,
+        event_versions,
+        versions["categories"][0],
+        versions["users"][0]
+    )
+    last_modified = latest([*(row.updated_at for row in current), versions["categories"][1], versions["users"][1]])
+    if conditional and is_not_modified(request, tag, last_modified):
+        return not_modified(tag, last_modified)
+    
+    key = ("events", ("batch", *ids), tag)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    # All events with their relationships in one query
+    found = {}
+    if current:
+        found = {event.id: event for event in (await db.execute(
+            select(Event)
+            .options(joinedload(Event.category), joinedload(Event.organizer))
+            .where(Event.id.in_([row.id for row in current]))
+        )).scalars()}
+    
+    content = {
+        "events": [found[event_id] for event_id in ids if event_id in found],
+        "missing": [event_id for event_id in ids if event_id not in found]
+    }
+    related = {("event", event.id) for event in found.values()} | {("category", event.category_id) for event in found.values()}
+    return cache_response(key, EVENT_BATCH_ADAPTER, content, validators(tag, last_modified), related)
+
+@router.get("/batch", response_model=EventBatchResponse)
+async def get_events_by_ids(
+    ids: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get several events by ID (e.g. ``ids=3,1,2``), in the order given. IDs that
+    do not exist are listed under ``missing``.
+    """
+    items = [item.strip() for item in ids.split(",")]
+    if not all(item.isdigit() for item in items):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid ids. Expected comma-separated integers"
+        )
+    return await get_event_batch(request, db, [int(item) for item in items], conditional=True)
+
+@router.post("/batch", response_model=EventBatchResponse)
+async def post_events_by_ids(
+    batch: EventBatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get several events by ID, for lists too long for a query string.
+    """
+    return await get_event_batch(request, db, batch.ids, conditional=False)
+
 @router.get("/{event_id}", response_model=EventDetailResponse)
-def get_event(
+async def get_event(
     event_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
-    # Get event
-    event = db.execute(select(Event).where(Event.id == event_id)).scalar_one_or_none()
+    # The detail embeds the event's category and organizer, so its tag covers
+    # the event's own version and those of both tables
+    current = (await db.execute(
+        select(Event.version, Event.updated_at).where(Event.id == event_id)
+    )).one_or_none()
+    if current is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    versions = await get_table_versions(db, "categories", "users")
+    tag = etag(
+        "event",
+        EVENT_DETAIL_REPRESENTATION,
+        current.version,
+        versions["categories"][0],
+        versions["users"][0]
+    )
+    last_modified = latest([current.updated_at, versions["categories"][1], versions["users"][1]])
+    if is_not_modified(request, tag, last_modified):
+        return not_modified(tag, last_modified)
+    
+    key = ("event", event_id, tag)
+    cached = cached_response(key)
+    if cached is not None:
+        return cached
+    
+    # Get event with the relationships the detail response needs, in one query
+    event = (await db.execute(
+        select(Event)
+        .options(joinedload(Event.category), joinedload(Event.organizer))
+        .where(Event.id == event_id)
+    )).scalar_one_or_none()
     if event is None:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Get attendee count
-    attendee_count = db.execute(
-        select(Registration).where(Registration.event_id == event_id)
-    ).scalars().all()
-    
-    # Create response
-    response = EventDetailResponse(
-        **{k: v for k, v in event.__dict__.items() if k != "_sa_instance_state"},
-        category=event.category,
-        organizer=event.organizer,
-        attendee_count=len(attendee_count)
+    # attendee_count and tickets_sold are maintained on the event row itself
+    return cache_response(
+        key,
+        EVENT_DETAIL_ADAPTER,
+        event,
+        validators(tag, last_modified),
+        related=[("category", event.category_id)]
     )
-    
-    return response
 
 @router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
-def create_event(
+async def create_event(
     event: EventCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_event_manager_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_event_manager_user)
 ):
     # Check if category exists
-    category = db.execute(select(Category).where(Category.id == event.category_id)).scalar_one_or_none()
+    category = (await db.execute(select(Category).where(Category.id == event.category_id))).scalar_one_or_none()
     if category is None:
         raise HTTPException(status_code=404, detail="Category not found")
     
@@ -102,19 +570,22 @@ def create_event(
         organizer_id=current_user.id
     )
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await adjust_stats(db, total_events=1, upcoming_events=int(is_upcoming(db_event.start_date)))
+    await bump_table_versions(db, "events")
+    await publish_invalidations(db, Invalidation("responses", "events"))
+    await db.commit()
+    await db.refresh(db_event)
     return db_event
 
 @router.put("/{event_id}", response_model=EventResponse)
-def update_event(
+async def update_event(
     event_id: int,
     event_update: EventUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
 ):
     # Get the existing event
-    db_event = db.execute(select(Event).where(Event.id == event_id)).scalar_one_or_none()
+    db_event = (await db.execute(select(Event).where(Event.id == event_id))).scalar_one_or_none()
     if db_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -139,7 +610,7 @@ def update_event(
     
     # If category_id is being updated, check if new category exists
     if 'category_id' in update_data:
-        category = db.execute(select(Category).where(Category.id == update_data['category_id'])).scalar_one_or_none()
+        category = (await db.execute(select(Category).where(Category.id == update_data['category_id']))).scalar_one_or_none()
         if category is None:
             raise HTTPException(status_code=404, detail="Category not found")
     
@@ -153,7 +624,7 @@ def update_event(
             update_data['start_date'] = datetime.fromisoformat(f"{date_str}T{time_str}")
         except (ValueError, AttributeError) as e:
             # Log error but continue with other updates
-            print(f"Error parsing date/time: {e}")
+            logger.warning("Error parsing date/time: %s", e)
     elif event_update.start_date is not None:
         update_data['start_date'] = event_update.start_date
     
@@ -166,7 +637,7 @@ def update_event(
             update_data['end_date'] = datetime.fromisoformat(f"{date_str}T{time_str}")
         except (ValueError, AttributeError) as e:
             # Log error but continue with other updates
-            print(f"Error parsing date/time: {e}")
+            logger.warning("Error parsing date/time: %s", e)
     elif event_update.end_date is not None:
         update_data['end_date'] = event_update.end_date
     
@@ -185,17 +656,36 @@ def update_event(
         if hasattr(event_update, field) and getattr(event_update, field) is not None:
             update_data[field] = getattr(event_update, field)
     
+    # Sending admission_rate: null switches the flash-sale queue off again
+    if 'admission_rate' in event_update.model_fields_set:
+        update_data['admission_rate'] = event_update.admission_rate
+    
     # Handle price and isFree
     if hasattr(event_update, 'isFree') and event_update.isFree:
         update_data['price'] = 0.0
     
+    # Keep the upcoming events aggregate in step with start date changes
+    if 'start_date' in update_data:
+        upcoming_delta = int(is_upcoming(update_data['start_date'])) - int(is_upcoming(db_event.start_date))
+        await adjust_stats(db, upcoming_events=upcoming_delta)
+    
     # Update the event object
     for key, value in update_data.items():
         if hasattr(db_event, key):
             setattr(db_event, key, value)
     
+    # Invalidate the event's ETag and cached responses, and those of the listings
+    db_event.version = Event.version + 1
+    db_event.updated_at = datetime.utcnow()
+    await bump_table_versions(db, "events")
+    await publish_invalidations(
+        db,
+        Invalidation("responses", "events"),
+        Invalidation("responses", "event", event_id)
+    )
+    
     # Commit changes
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await db.refresh(db_event)
     
     return db_event
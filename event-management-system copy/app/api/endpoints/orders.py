@@ -1,83 +1,213 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import insert, select
+from typing import List, Optional
 import json
 import logging
 
 from app.db.base import get_db
-from app.models import Order, OrderItem, User, Event
+from app.db.counters import reserve_tickets, seats_left
+from app.db.retry import run_with_retry
+from app.db.stats import adjust_stats
+from app.models import Order, OrderItem, Event
+from app.schemas.user import UserResponse
 from app.schemas.order import OrderCreate, Order as OrderSchema
-from app.core.security import get_current_user
+from app.api.endpoints.registrations import get_managed_event
+from app.core.admission import admission_queue
+from app.core.export import export_format, stream_export
+from app.core.security import get_current_active_user, get_current_user
 
 router = APIRouter()
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+SALES_EXPORT_COLUMNS = (
+    "order_id",
+    "created_at",
+    "status",
+    "user_id",
+    "customer_name",
+    "customer_email",
+    "event_id",
+    "quantity",
+    "price",
+    "line_total",
+)
+
 @router.post("/", response_model=OrderSchema, status_code=status.HTTP_201_CREATED)
-def create_order(order: OrderCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_order(order: OrderCreate, db: AsyncSession = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     """
     Create a new order
     """
-    logger.debug(f"Creating order for user ID: {current_user.id}, email: {current_user.email}")
-    logger.debug(f"Order data: {order.dict()}")
+    logger.debug("Creating order with %d items for user ID: %s", len(order.items), current_user.id)
     
-    # Create order
-    db_order = Order(
-        user_id=current_user.id,
-        total=order.total,
-        customer_info=order.customer.dict(),
-        status="completed"
-    )
-    db.add(db_order)
-    db.flush()  # Get ID without committing
-
-    logger.debug(f"Created order with ID: {db_order.id}")
-
-    # Create order items
-    for item in order.items:
-        # Verify event exists
-        event = db.query(Event).filter(Event.id == item.eventId).first()
-        if not event:
-            logger.error(f"Event with ID {item.eventId} not found")
-            db.rollback()
+    if not order.items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Order must contain at least one item"
+        )
+    
+    # Validate the whole cart with a single query and price it from the database
+    event_ids = {item.eventId for item in order.items}
+    events = {
+        row.id: row for row in (await db.execute(
+            select(Event.id, Event.price, Event.admission_rate, seats_left().label("seats_left")).where(Event.id.in_(event_ids))
+        )).all()
+    }
+    missing = sorted(event_ids - events.keys())
+    if missing:
+        logger.error("Events not found: %s", missing)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Event with ID {missing[0]} not found"
+        )
+    
+    items = [
+        {"event_id": item.eventId, "quantity": item.quantity, "price": events[item.eventId].price or 0.0}
+        for item in order.items
+    ]
+    total = sum(item["price"] * item["quantity"] for item in items)
+    quantities = {}
+    for item in items:
+        quantities[item["event_id"]] = quantities.get(item["event_id"], 0) + item["quantity"]
+    
+    # Events on a flash sale only sell to buyers admitted from their queue
+    queued = [event_id for event_id in quantities if events[event_id].admission_rate]
+    for event_id in queued:
+        if not await admission_queue.is_admitted(db, order.queueToken, event_id, current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Wait for your turn in the queue for event with ID {event_id}",
+                headers={"Retry-After": str(await admission_queue.retry_after(db, order.queueToken))}
+            )
+    
+    # Fail fast on events that are already sold out; the reservation below is
+    # what actually guarantees no overselling
+    for event_id, quantity in quantities.items():
+        if events[event_id].seats_left is not None and events[event_id].seats_left < quantity:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Not enough seats left for event with ID {event_id}"
+            )
+    
+    async def place_order():
+        # Spend the queue token in this transaction, so it buys one order at most
+        if queued and not await admission_queue.claim(db, order.queueToken, queued, current_user.id):
+            await db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Event with ID {item.eventId} not found"
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Queue token was already used or has expired",
+                headers={"Retry-After": "1"}
             )
         
-        # Create order item
-        db_item = OrderItem(
-            order_id=db_order.id,
-            event_id=item.eventId,
-            quantity=item.quantity,
-            price=item.price
+        # Reserve the seats first: nothing else is written if they are gone
+        if not await reserve_tickets(db, quantities):
+            await db.rollback()
+            logger.info("Seats ran out during checkout for events %s", sorted(quantities))
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Not enough seats left for this order"
+            )
+        
+        db_order = Order(
+            user_id=current_user.id,
+            total=total,
+            customer_info=order.customer.model_dump(),
+            status="completed"
         )
-        db.add(db_item)
-        logger.debug(f"Added order item for event: {item.eventId}, quantity: {item.quantity}")
-
-    # Commit all changes
-    db.commit()
-    db.refresh(db_order)
-    logger.debug("Order committed successfully")
+        db.add(db_order)
+        await db.flush()  # Get ID without committing
+        logger.debug("Created order with ID: %s", db_order.id)
+        
+        # Create all order items with one bulk insert
+        await db.execute(insert(OrderItem), [dict(item, order_id=db_order.id) for item in items])
+        await adjust_stats(
+            db,
+            total_orders=1,
+            tickets_sold=sum(quantities.values()),
+            total_revenue=total
+        )
+        
+        # Commit all changes
+        await db.commit()
+        logger.debug("Order committed successfully")
+        return db_order.id
     
-    return db_order
+    order_id = await run_with_retry(db, place_order)
+    
+    # Reload the order with its items for the response
+    return (await db.execute(
+        select(Order).options(selectinload(Order.items)).where(Order.id == order_id)
+    )).scalar_one()
 
 @router.get("/", response_model=List[OrderSchema])
-def get_user_orders(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_user_orders(db: AsyncSession = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     """
     Get all orders for the current user
     """
-    orders = db.query(Order).filter(Order.user_id == current_user.id).all()
+    orders = (await db.execute(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.user_id == current_user.id)
+        .order_by(Order.created_at.desc())
+    )).scalars().all()
     return orders
 
+@router.get("/export")
+async def export_sales(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user),
+    event_id: Optional[int] = None,
+    format: str = "csv"
+):
+    """
+    Download order lines as CSV or NDJSON: those of one event (organizer or
+    admin), or of every event (admin only) when no ``event_id`` is given.
+    
+    Rows are streamed as they are read, so the export size is not limited by memory.
+    """
+    format = export_format(format)
+    if event_id is not None:
+        await get_managed_event(db, event_id, current_user)
+    elif current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    query = (
+        select(
+            Order.id,
+            Order.created_at,
+            Order.status,
+            Order.user_id,
+            Order.customer_info["name"].as_string(),
+            Order.customer_info["email"].as_string(),
+            OrderItem.event_id,
+            OrderItem.quantity,
+            OrderItem.price,
+            OrderItem.quantity * OrderItem.price
+        )
+        .join(Order, OrderItem.order_id == Order.id)
+        .order_by(OrderItem.id)
+    )
+    if event_id is not None:
+        query = query.where(OrderItem.event_id == event_id)
+    
+    filename = "sales" if event_id is None else f"event-{event_id}-sales"
+    return stream_export(query, SALES_EXPORT_COLUMNS, format, filename)
+
 @router.get("/{order_id}", response_model=OrderSchema)
-def get_order(order_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_order(order_id: int, db: AsyncSession = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     """
     Get a specific order by ID
     """
-    order = db.query(Order).filter(Order.id == order_id, Order.user_id == current_user.id).first()
+    order = (await db.execute(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.id == order_id, Order.user_id == current_user.id)
+    )).scalar_one_or_none()
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,13 +1,424 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+import base64
 
-from app.database import get_db
+from app.db.base import get_db
+from app.db.checkins import checkin_buffer, mark_checked_in
+from app.db.counters import adjust_attendee_count, reserve_attendee
+from app.db.retry import run_with_retry
+from app.db.stats import adjust_stats
+from app.models.event import Event
+from app.models.registration import Registration
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.schemas.registration import (
+    AttendeeResponse,
+    RegistrationResponse,
+    ScannerKeyResponse,
+    ScanSyncRequest,
+    ScanSyncResponse,
+)
+from app.core.config import TICKET_CODE_GRACE_SECONDS
+from app.core.export import export_format, stream_export
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset
+from app.core.security import get_current_active_user
+from app.core.ticket_codes import create_ticket_code, event_signing_key, verify_ticket_code
 
 router = APIRouter()
 
-@router.post("/{event_id}/register", status_code=status.HTTP_201_CREATED)
-def register_for_event(event_id: int):
+# Sort keys accepted by attendee listings (prefix with "-" for descending)
+ATTENDEE_SORT_FIELDS = {
+    "id": Registration.id,
+}
+
+ATTENDEE_EXPORT_COLUMNS = (
+    "registration_id",
+    "ticket_id",
+    "registration_date",
+    "checked_in",
+    "checked_in_time",
+    "user_id",
+    "name",
+    "email",
+)
+
+def ticket_code_expiry(event) -> datetime:
+    # Events without an end date are over, for their tickets, once they have started
+    return (event.end_date or event.start_date) + timedelta(seconds=TICKET_CODE_GRACE_SECONDS)
+
+async def get_managed_event(db: AsyncSession, event_id: int, current_user: UserResponse) -> Event:
+    """Load an event the current user organizes (or any event for admins)."""
+    event = (await db.execute(select(Event).where(Event.id == event_id))).scalar_one_or_none()
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if event.organizer_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to manage attendees of this event"
+        )
+    return event
+
+def already_registered() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Already registered for this event"
+    )
+
+@router.post("/{event_id}/register", response_model=RegistrationResponse, status_code=status.HTTP_201_CREATED)
+async def register_for_event(
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
     """
     Register for an event.
     """
-    return {"message": f"Register for event {event_id}"}
+    event = (await db.execute(
+        select(Event.id, Event.is_published, Event.start_date, Event.end_date).where(Event.id == event_id)
+    )).one_or_none()
+    if event is None or not event.is_published:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    # Fast path for repeated clicks; the unique index is what prevents duplicates
+    existing = (await db.execute(
+        select(Registration.id).where(Registration.event_id == event_id, Registration.user_id == current_user.id)
+    )).scalar_one_or_none()
+    if existing is not None:
+        raise already_registered()
+    
+    async def register():
+        # Take the seat first: nothing is written if the event is full
+        if not await reserve_attendee(db, event_id):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Event is full"
+            )
+        registration = Registration(
+            event_id=event_id,
+            user_id=current_user.id,
+            checked_in=False
+        )
+        db.add(registration)
+        try:
+            await db.flush()  # The signed ticket code embeds the registration ID
+        except IntegrityError:
+            # A concurrent request registered this user first; the seat is released too
+            await db.rollback()
+            raise already_registered()
+        registration.ticket_id = create_ticket_code(event_id, registration.id, ticket_code_expiry(event))
+        await adjust_stats(db, total_registrations=1)
+        await db.commit()
+        return registration
+    
+    return await run_with_retry(db, register)
+
+@router.get("/{event_id}/attendees", response_model=List[AttendeeResponse])
+async def get_event_attendees(
+    event_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user),
+    skip: int = 0,
+    limit: int = 100,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """
+    List the attendees of an event (organizer or admin only).
+    """
+    page = keyset(sort, cursor, ATTENDEE_SORT_FIELDS, Registration.id)
+    await get_managed_event(db, event_id, current_user)
+    
+    # Registrations and their users in one query, walking the event_id index
+    query = page.apply(
+        select(
+            Registration.id,
+            Registration.ticket_id,
+            Registration.registration_date,
+            Registration.checked_in,
+            Registration.checked_in_time,
+            User.id.label("user_id"),
+            User.name,
+            User.email
+        )
+        .join(User, Registration.user_id == User.id)
+        .where(Registration.event_id == event_id)
+    )
+    if cursor is None and skip:
+        query = query.offset(skip)
+    rows = (await db.execute(query.limit(limit))).all()
+    
+    next_cursor = page.next_cursor(rows, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    attendees = []
+    for row in rows:
+        # Include check-ins still waiting for their batch to commit
+        pending = checkin_buffer.pending_time(row.id)
+        attendees.append({
+            "id": row.id,
+            "ticket_id": row.ticket_id,
+            "registration_date": row.registration_date,
+            "checked_in": bool(row.checked_in) or pending is not None,
+            "checked_in_time": row.checked_in_time or pending,
+            "user": {"id": row.user_id, "name": row.name, "email": row.email}
+        })
+    return attendees
+
+@router.get("/{event_id}/attendees/export")
+async def export_event_attendees(
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user),
+    format: str = "csv"
+):
+    """
+    Download the attendees of an event as CSV or NDJSON (organizer or admin only).
+    
+    Rows are streamed as they are read, so the export size is not limited by memory.
+    """
+    format = export_format(format)
+    await get_managed_event(db, event_id, current_user)
+    
+    query = (
+        select(
+            Registration.id,
+            Registration.ticket_id,
+            Registration.registration_date,
+            Registration.checked_in,
+            Registration.checked_in_time,
+            User.id.label("user_id"),
+            User.name,
+            User.email
+        )
+        .join(User, Registration.user_id == User.id)
+        .where(Registration.event_id == event_id)
+        .order_by(Registration.id)
+    )
+    
+    def with_pending_check_in(row):
+        # Include check-ins still waiting for their batch to commit
+        pending = checkin_buffer.pending_time(row.id)
+        return (
+            row.id,
+            row.ticket_id,
+            row.registration_date,
+            bool(row.checked_in) or pending is not None,
+            row.checked_in_time or pending,
+            row.user_id,
+            row.name,
+            row.email
+        )
+    
+    return stream_export(query, ATTENDEE_EXPORT_COLUMNS, format, f"event-{event_id}-attendees", with_pending_check_in)
+
+async def check_in(db: AsyncSession, event_id: int, current_user: UserResponse, condition):
+    """
+    Check in the registration matching ``condition``.
+    
+    The scan is validated with one indexed read and handed to the check-in
+    buffer, which commits check-ins to the database in batches and answers it
+    once its batch has decided whether the ticket was already checked in.
+    """
+    row = (await db.execute(
+        select(
+            Registration.id,
+            Registration.event_id,
+            Registration.user_id,
+            Registration.registration_date,
+            Registration.ticket_id,
+            Registration.checked_in,
+            Event.organizer_id
+        )
+        .join(Event, Registration.event_id == Event.id)
+        .where(condition, Registration.event_id == event_id)
+    )).one_or_none()
+    if row is None:
+        await get_managed_event(db, event_id, current_user)
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    if row.organizer_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to manage attendees of this event"
+        )
+    
+    checked_in_time = datetime.utcnow()
+    if row.checked_in or not await checkin_buffer.record(row.id, event_id, checked_in_time):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ticket already checked in"
+        )
+    return {
+        "id": row.id,
+        "event_id": row.event_id,
+        "user_id": row.user_id,
+        "registration_date": row.registration_date,
+        "ticket_id": row.ticket_id,
+        "checked_in": True,
+        "checked_in_time": checked_in_time
+    }
+
+@router.put("/{event_id}/attendees/{attendee_id}/check-in", response_model=RegistrationResponse)
+async def check_in_attendee(
+    event_id: int,
+    attendee_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Check in an attendee by registration ID (organizer or admin only).
+    """
+    return await check_in(db, event_id, current_user, Registration.id == attendee_id)
+
+@router.put("/{event_id}/check-in/{ticket_id}", response_model=RegistrationResponse)
+async def check_in_ticket(
+    event_id: int,
+    ticket_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Check in the holder of a ticket ID, as read by a gate scanner (organizer or admin only).
+    
+    Signed codes are verified before touching the database and then matched by
+    registration ID; older unsigned ticket IDs are looked up as they are.
+    """
+    claims = verify_ticket_code(ticket_id)
+    if claims is None:
+        return await check_in(db, event_id, current_user, Registration.ticket_id == ticket_id)
+    if claims.event_id != event_id:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    if claims.is_expired():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Ticket has expired"
+        )
+    return await check_in(db, event_id, current_user, Registration.id == claims.registration_id)
+
+@router.get("/{event_id}/scanner-key", response_model=ScannerKeyResponse)
+async def get_scanner_key(
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Get the key gate scanners use to verify this event's ticket codes offline (organizer or admin only).
+    """
+    await get_managed_event(db, event_id, current_user)
+    return {
+        "event_id": event_id,
+        "key": base64.urlsafe_b64encode(event_signing_key(event_id)).decode().rstrip("="),
+        "algorithm": "HMAC-SHA256, first 10 bytes, over the first 13 bytes of the base64url-decoded code"
+    }
+
+@router.post("/{event_id}/scans", response_model=ScanSyncResponse)
+async def sync_scans(
+    event_id: int,
+    scan_log: ScanSyncRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Ingest a batch of scans recorded offline by gate scanners (organizer or admin only).
+    
+    Every registration ends up checked in at its earliest valid scan. Repeated
+    scans of a ticket, within the batch or already known from an earlier sync
+    or online check-in, are counted as duplicates.
+    """
+    await get_managed_event(db, event_id, current_user)
+    
+    # Verify the codes and group the valid scans by registration
+    rejected = []
+    scans = {}
+    for scan in scan_log.scans:
+        scanned_at = scan.scanned_at
+        if scanned_at.tzinfo is not None:
+            scanned_at = scanned_at.astimezone(timezone.utc).replace(tzinfo=None)
+        claims = verify_ticket_code(scan.code)
+        if claims is None or claims.event_id != event_id:
+            rejected.append({"code": scan.code, "reason": "invalid"})
+        elif claims.is_expired(scanned_at):
+            rejected.append({"code": scan.code, "reason": "expired"})
+        else:
+            scans.setdefault(claims.registration_id, []).append((scanned_at, scan.code))
+    
+    # One query for the current state of all scanned registrations
+    known = dict((await db.execute(
+        select(Registration.id, Registration.checked_in_time)
+        .where(Registration.id.in_(scans), Registration.event_id == event_id)
+    )).all())
+    
+    # Every scan is counted once: the earliest scan of a registration that was
+    # not checked in yet checks it in, every other scan of it is a duplicate
+    updates = []
+    checked_in = 0
+    duplicates = 0
+    for registration_id, registration_scans in scans.items():
+        if registration_id not in known:
+            rejected.extend({"code": code, "reason": "not found"} for _, code in registration_scans)
+            continue
+        scanned_at = min(scanned_at for scanned_at, _ in registration_scans)
+        if known[registration_id] is None or scanned_at < known[registration_id]:
+            updates.append({"registration_id": registration_id, "checked_in_time": scanned_at})
+        if known[registration_id] is None:
+            checked_in += 1
+            duplicates += len(registration_scans) - 1
+        else:
+            duplicates += len(registration_scans)
+    
+    # Apply them in one executemany; the time only ever moves earlier, so a
+    # concurrent check-in or an overlapping sync cannot be overwritten
+    if updates:
+        async def record_scans():
+            await mark_checked_in(db, updates)
+            await db.commit()
+        
+        await run_with_retry(db, record_scans)
+    
+    return {
+        "received": len(scan_log.scans),
+        "checked_in": checked_in,
+        "duplicates": duplicates,
+        "rejected": rejected
+    }
+
+@router.delete("/{event_id}/attendees/{attendee_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_attendee(
+    event_id: int,
+    attendee_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """
+    Remove a registration (the organizer, an admin or the attendee themselves).
+    """
+    registration = (await db.execute(
+        select(Registration.user_id, Event.organizer_id)
+        .join(Event, Registration.event_id == Event.id)
+        .where(Registration.id == attendee_id, Registration.event_id == event_id)
+    )).one_or_none()
+    if registration is None:
+        raise HTTPException(status_code=404, detail="Attendee not found")
+    if current_user.id not in (registration.user_id, registration.organizer_id) and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to remove this attendee"
+        )
+    
+    # Delete the registration and free its seat in the same transaction
+    async def unregister():
+        result = await db.execute(delete(Registration).where(Registration.id == attendee_id))
+        # A concurrent request may have removed it already
+        if result.rowcount:
+            await adjust_attendee_count(db, event_id, -1)
+            await adjust_stats(db, total_registrations=-1)
+        await db.commit()
+    
+    await run_with_retry(db, unregister)
+    return None
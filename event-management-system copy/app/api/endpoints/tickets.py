@@ -1,100 +1,134 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select
 from typing import List
 import logging
 
 from app.db.base import get_db
-from app.models import Order, OrderItem, User, Event
+from app.db.counters import adjust_tickets_sold
+from app.db.retry import run_with_retry
+from app.db.stats import adjust_stats
+from app.models import Order, OrderItem, Event
+from app.schemas.user import UserResponse
 from app.schemas.ticket import TicketResponse
 from app.core.security import get_current_user
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+@router.get("", response_model=List[TicketResponse])
 @router.get("/my-tickets", response_model=List[TicketResponse])
-def get_my_tickets(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_my_tickets(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+    skip: int = 0,
+    limit: int = 100
+):
     """
     Get all tickets for the current user from their orders
     """
-    logger.debug(f"Fetching tickets for user ID: {current_user.id}")
+    logger.debug("Fetching tickets for user ID: %s", current_user.id)
     
-    # Get all orders for the user
-    orders = db.query(Order).filter(Order.user_id == current_user.id).all()
+    # Load order items together with their order and event in a single query
+    query = (
+        select(
+            OrderItem.id,
+            OrderItem.quantity,
+            OrderItem.price,
+            Order.created_at,
+            Order.customer_info,
+            Event.id.label("event_id"),
+            Event.title,
+            Event.start_date,
+            Event.location
+        )
+        .join(Order, OrderItem.order_id == Order.id)
+        .join(Event, OrderItem.event_id == Event.id)
+        .where(Order.user_id == current_user.id)
+        .order_by(Order.created_at.desc(), OrderItem.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    rows = (await db.execute(query)).all()
     
     tickets = []
-    
-    # Extract tickets from order items
-    for order in orders:
-        logger.debug(f"Processing order ID: {order.id}")
+    for row in rows:
+        customer_info = row.customer_info or {}
         
-        for item in order.items:
-            # Get event details
-            event = db.query(Event).filter(Event.id == item.event_id).first()
-            
-            if not event:
-                logger.warning(f"Event with ID {item.event_id} not found for order item {item.id}")
-                continue
-                
-            # Create ticket response
-            ticket = {
-                "id": item.id,
-                "event": {
-                    "id": event.id,
-                    "title": event.title,
-                    "date": event.start_date,
-                    "location": event.location
-                },
-                "quantity": item.quantity,
-                "ticketType": "Standard",  # Default type since we don't have ticket types in the model
-                "totalPrice": item.price * item.quantity,
-                "status": "active",  # Default status since we don't track used/canceled
-                "purchaseDate": order.created_at,
-                "attendee": {
-                    "name": order.customer_info.get("name", ""),
-                    "email": order.customer_info.get("email", ""),
-                    "phone": order.customer_info.get("phone", "")
-                }
+        # Create ticket response
+        ticket = {
+            "id": row.id,
+            "event": {
+                "id": row.event_id,
+                "title": row.title,
+                "date": row.start_date,
+                "location": row.location
+            },
+            "quantity": row.quantity,
+            "ticketType": "Standard",  # Default type since we don't have ticket types in the model
+            "totalPrice": row.price * row.quantity,
+            "status": "active",  # Default status since we don't track used/canceled
+            "purchaseDate": row.created_at,
+            "attendee": {
+                "name": customer_info.get("name", ""),
+                "email": customer_info.get("email", ""),
+                "phone": customer_info.get("phone", "")
             }
-            
-            tickets.append(ticket)
+        }
+        
+        tickets.append(ticket)
     
-    logger.debug(f"Returning {len(tickets)} tickets")
+    logger.debug("Returning %d tickets", len(tickets))
     return tickets
 
 @router.delete("/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
-def cancel_ticket(ticket_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def cancel_ticket(ticket_id: int, db: AsyncSession = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     """
     Cancel a ticket (actually delete the order item)
     """
-    logger.debug(f"Canceling ticket (order item) ID: {ticket_id}")
+    logger.debug("Canceling ticket (order item) ID: %s", ticket_id)
     
     # Find the order item
-    order_item = db.query(OrderItem).filter(OrderItem.id == ticket_id).first()
+    order_item = (await db.execute(select(OrderItem).where(OrderItem.id == ticket_id))).scalar_one_or_none()
     
     if not order_item:
-        logger.warning(f"Ticket with ID {ticket_id} not found")
+        logger.warning("Ticket with ID %s not found", ticket_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found"
         )
     
     # Get the order to check ownership
-    order = db.query(Order).filter(Order.id == order_item.order_id).first()
+    order = (await db.execute(select(Order).where(Order.id == order_item.order_id))).scalar_one_or_none()
     
     if not order or order.user_id != current_user.id:
-        logger.warning(f"User {current_user.id} tried to cancel ticket {ticket_id} they don't own")
+        logger.warning("User %s tried to cancel ticket %s they don't own", current_user.id, ticket_id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to cancel this ticket"
         )
     
-    # Delete the order item
-    db.delete(order_item)
-    db.commit()
+    # Delete the order item and release its seats in the same transaction,
+    # using the quantity and price of the row the DELETE actually removed
+    async def release_ticket():
+        removed = (await db.execute(
+            delete(OrderItem)
+            .where(OrderItem.id == ticket_id, OrderItem.order_id == order.id)
+            .returning(OrderItem.event_id, OrderItem.quantity, OrderItem.price)
+            .execution_options(synchronize_session=False)
+        )).one_or_none()
+        # A concurrent request may have canceled it already
+        if removed is not None:
+            await adjust_tickets_sold(db, removed.event_id, -removed.quantity)
+            await adjust_stats(
+                db,
+                tickets_sold=-removed.quantity,
+                total_revenue=-removed.price * removed.quantity
+            )
+        await db.commit()
+    
+    await run_with_retry(db, release_ticket)
     
-    logger.debug(f"Ticket {ticket_id} successfully canceled")
+    logger.debug("Ticket %s successfully canceled", ticket_id)
     return None
@@ -1,90 +1,126 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Annotated
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Annotated, Optional
 from sqlalchemy import select
 
 from app.db.base import get_db
+from app.db.stats import adjust_stats, user_status_deltas
+from app.db.invalidation import Invalidation, publish_invalidations
+from app.db.versions import bump_table_versions
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
+from app.core.pagination import NEXT_CURSOR_HEADER, keyset
 from app.core.security import get_current_active_user, get_current_admin_user
 
 # Create the router (named exactly like the module for easier import)
 router = APIRouter()
 
+# Sort keys accepted by user listings (prefix with "-" for descending)
+USER_SORT_FIELDS = {
+    "created_at": User.created_at,
+    "email": User.email,
+    "name": User.name,
+    "id": User.id,
+}
+
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+    current_user: Annotated[UserResponse, Depends(get_current_active_user)]
 ):
     return current_user
 
 @router.put("/me", response_model=UserResponse)
 async def update_user_me(
     user_update: UserUpdate,
-    current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Session = Depends(get_db)
+    current_user: Annotated[UserResponse, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_db)
 ):
+    # current_user is a cached snapshot; load the row to update it
+    user = (await db.execute(select(User).where(User.id == current_user.id))).scalar_one()
+    
     # Update only allowed fields
     if user_update.name is not None:
-        current_user.name = user_update.name
+        user.name = user_update.name
     if user_update.email is not None:
         # Check if email is already used
-        existing_user = db.execute(
+        existing_user = (await db.execute(
             select(User).where(User.email == user_update.email)
-        ).scalar_one_or_none()
-        if existing_user and existing_user.id != current_user.id:
+        )).scalar_one_or_none()
+        if existing_user and existing_user.id != user.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        current_user.email = user_update.email
+        user.email = user_update.email
     
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    await bump_table_versions(db, "users")
+    await publish_invalidations(db, Invalidation("users", item_id=user.id))
+    await db.commit()
+    await db.refresh(user)
+    return user
 
 @router.get("", response_model=List[UserResponse])
-def get_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user),
+async def get_users(
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    users = db.execute(select(User).offset(skip).limit(limit)).scalars().all()
+    page = keyset(sort, cursor, USER_SORT_FIELDS, User.id)
+    query = page.apply(select(User))
+    if cursor is None and skip:
+        query = query.offset(skip)
+    users = (await db.execute(query.limit(limit))).scalars().all()
+    
+    next_cursor = page.next_cursor(users, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return users
 
 @router.patch("/{user_id}/activate", response_model=UserResponse)
-def activate_user(
+async def activate_user(
     user_id: int,
     activate: bool,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user)
 ):
     """
     Activate or deactivate a user (admin only)
     """
     # Find the user
-    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Update activation status
+    if bool(user.is_active) != activate:
+        await adjust_stats(
+            db,
+            active_users=1 if activate else -1,
+            pending_users=-1 if activate else 1
+        )
     user.is_active = activate
-    db.commit()
-    db.refresh(user)
+    await bump_table_versions(db, "users")
+    await publish_invalidations(db, Invalidation("users", item_id=user.id))
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user)
 ):
     """
     Update a user's information (admin only)
     """
     # Find the user
-    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -93,9 +129,9 @@ def update_user(
         user.name = user_update.name
     if user_update.email is not None:
         # Check if email is already used
-        existing_user = db.execute(
+        existing_user = (await db.execute(
             select(User).where(User.email == user_update.email)
-        ).scalar_one_or_none()
+        )).scalar_one_or_none()
         if existing_user and existing_user.id != user.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -105,21 +141,23 @@ def update_user(
     if user_update.role is not None:
         user.role = user_update.role
     
-    db.commit()
-    db.refresh(user)
+    await bump_table_versions(db, "users")
+    await publish_invalidations(db, Invalidation("users", item_id=user.id))
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_admin_user)
 ):
     """
     Delete a user (admin only)
     """
     # Find the user
-    user = db.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -131,7 +169,11 @@ def delete_user(
         )
     
     # Delete the user
-    db.delete(user)
-    db.commit()
+    await adjust_stats(db, **user_status_deltas(bool(user.is_active), sign=-1))
+    await db.delete(user)
+    # Their events lose their organizer
+    await bump_table_versions(db, "users", "events")
+    await publish_invalidations(db, Invalidation("users", item_id=user_id))
+    await db.commit()
     
     return None
@@ -0,0 +1,208 @@
+"""
+Flash-sale admission queue.
+
+When an event has an ``admission_rate``, buyers first join its queue and get an
+opaque token with a position. Tokens are admitted to checkout in order, at most
+``admission_rate`` per second. Checkout write load on the single SQLite writer
+is thereby bounded by the configured rates.
+
+The queue is kept in the database so that every worker process sees the same
+one. Joining schedules the buyer's admission time up front (a generic cell rate
+algorithm: ``admission_schedules.next_admission_at`` advances by ``1 / rate``
+per buyer, with a burst of one second's worth of buyers), so polling the status
+is a single primary key lookup and no background task is needed.
+
+An admitted token is valid for one checkout within the admission window. The
+checkout spends it with a conditional DELETE in the order's own transaction,
+so two concurrent checkouts cannot both use the same token.
+"""
+
+import math
+import secrets
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import ADMISSION_MAX_WAITING, ADMISSION_WINDOW_SECONDS
+from app.models.admission import AdmissionSchedule, AdmissionTicket
+
+class AdmissionQueueFull(Exception):
+    """Raised when an event's queue already holds its maximum number of waiting buyers."""
+
+# Claims the next admission slot of an event in one statement, creating its
+# schedule on first use
+_SCHEDULE_NEXT = text(
+    "INSERT INTO admission_schedules (event_id, rate, last_position, next_admission_at, completed) "
+    "VALUES (:event_id, :rate, 1, :now + :interval, 0) "
+    "ON CONFLICT (event_id) DO UPDATE SET "
+    "rate = excluded.rate, "
+    "last_position = last_position + 1, "
+    "next_admission_at = max(next_admission_at, :now) + :interval "
+    "RETURNING last_position, next_admission_at"
+)
+
+class AdmissionQueue:
+    """Per-event FIFO queues that admit a bounded number of buyers per second."""
+
+    def __init__(self, window: float, max_waiting: int):
+        self.window = window
+        self.max_waiting = max_waiting
+
+    async def join(self, db: AsyncSession, event_id: int, user_id: int, rate: int) -> AdmissionTicket:
+        """
+        Put a buyer in the event's queue, or return the ticket they already hold.
+
+        Writes in the caller's transaction, which the caller commits; on
+        ``AdmissionQueueFull`` it must roll back instead.
+        """
+        now = time.time()
+        await db.execute(
+            delete(AdmissionTicket)
+            .where(AdmissionTicket.event_id == event_id, AdmissionTicket.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+        ticket = (await db.execute(
+            select(AdmissionTicket).where(AdmissionTicket.event_id == event_id, AdmissionTicket.user_id == user_id)
+        )).scalar_one_or_none()
+        if ticket is not None:
+            return ticket
+
+        interval = 1 / rate
+        # A fresh queue admits up to one second's worth of buyers at once
+        burst = (rate - 1) * interval
+        slot = (await db.execute(
+            _SCHEDULE_NEXT, {"event_id": event_id, "rate": rate, "now": now, "interval": interval}
+        )).one()
+        admitted_at = max(now, slot.next_admission_at - interval - burst)
+        # Buyers are admitted 1 / rate seconds apart, so the wait gives the count waiting
+        if math.ceil((admitted_at - now) * rate) > self.max_waiting:
+            raise AdmissionQueueFull()
+
+        ticket = AdmissionTicket(
+            token=secrets.token_urlsafe(16),
+            event_id=event_id,
+            user_id=user_id,
+            position=slot.last_position,
+            admitted_at=admitted_at,
+            expires_at=admitted_at + self.window,
+        )
+        db.add(ticket)
+        await db.flush()
+        return ticket
+
+    async def status(self, db: AsyncSession, token: str) -> Optional[dict]:
+        """Position and admission state of a token, or None if it is unknown or expired."""
+        row = (await db.execute(
+            select(AdmissionTicket, AdmissionSchedule.rate)
+            .join(AdmissionSchedule, AdmissionSchedule.event_id == AdmissionTicket.event_id)
+            .where(AdmissionTicket.token == token)
+        )).one_or_none()
+        if row is None:
+            return None
+        return self.describe(row.AdmissionTicket, row.rate)
+
+    def describe(self, ticket: AdmissionTicket, rate: int, now: Optional[float] = None) -> Optional[dict]:
+        """Status of a ticket at ``now``, or None once its checkout window has passed."""
+        now = time.time() if now is None else now
+        if ticket.expires_at <= now:
+            return None
+        wait = max(0.0, ticket.admitted_at - now)
+        admitted = wait == 0
+        return {
+            "event_id": ticket.event_id,
+            "position": ticket.position,
+            "ahead": max(0, math.ceil(wait * rate) - 1),
+            "admitted": admitted,
+            "expires_in": round(ticket.expires_at - now, 1) if admitted else None,
+            "estimated_wait": math.ceil(wait),
+        }
+
+    async def is_admitted(self, db: AsyncSession, token: Optional[str], event_id: int, user_id: int) -> bool:
+        """
+        Whether ``token`` lets ``user_id`` check out tickets for ``event_id`` right now.
+
+        Only a fast pre-check: ``claim`` is what spends the token.
+        """
+        if not token:
+            return False
+        now = time.time()
+        return (await db.execute(
+            select(AdmissionTicket.token).where(
+                AdmissionTicket.token == token,
+                AdmissionTicket.event_id == event_id,
+                AdmissionTicket.user_id == user_id,
+                AdmissionTicket.admitted_at <= now,
+                AdmissionTicket.expires_at > now,
+            )
+        )).first() is not None
+
+    async def retry_after(self, db: AsyncSession, token: Optional[str]) -> int:
+        """Seconds a buyer should wait before polling again."""
+        state = await self.status(db, token) if token else None
+        return max(1, state["estimated_wait"]) if state else 1
+
+    async def claim(self, db: AsyncSession, token: Optional[str], event_ids: Iterable[int], user_id: int) -> bool:
+        """
+        Spend an admitted token on a checkout of ``event_ids``, in the caller's
+        transaction. Returns False when it does not admit the buyer to every
+        one of them (or was spent concurrently); the caller must then roll back.
+        """
+        now = time.time()
+        for event_id in event_ids:
+            result = await db.execute(
+                delete(AdmissionTicket)
+                .where(
+                    AdmissionTicket.token == token,
+                    AdmissionTicket.event_id == event_id,
+                    AdmissionTicket.user_id == user_id,
+                    AdmissionTicket.admitted_at <= now,
+                    AdmissionTicket.expires_at > now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                return False
+            await db.execute(
+                update(AdmissionSchedule)
+                .where(AdmissionSchedule.event_id == event_id)
+                .values(completed=AdmissionSchedule.completed + 1)
+                .execution_options(synchronize_session=False)
+            )
+        return True
+
+    async def stats(self, db: AsyncSession) -> dict:
+        """Queue depth and admission counters per event."""
+        now = time.time()
+        waiting = func.count(AdmissionTicket.token).filter(AdmissionTicket.admitted_at > now)
+        admitted = func.count(AdmissionTicket.token).filter(AdmissionTicket.admitted_at <= now)
+        live = (
+            select(AdmissionTicket.event_id, waiting.label("waiting"), admitted.label("admitted"))
+            .where(AdmissionTicket.expires_at > now)
+            .group_by(AdmissionTicket.event_id)
+            .subquery()
+        )
+        rows = (await db.execute(
+            select(
+                AdmissionSchedule.event_id,
+                AdmissionSchedule.rate,
+                AdmissionSchedule.completed,
+                func.coalesce(live.c.waiting, 0).label("waiting"),
+                func.coalesce(live.c.admitted, 0).label("admitted"),
+            )
+            .outerjoin(live, live.c.event_id == AdmissionSchedule.event_id)
+            .order_by(AdmissionSchedule.event_id)
+        )).all()
+        events = {
+            row.event_id: {"rate": row.rate, "waiting": row.waiting, "admitted": row.admitted, "completed": row.completed}
+            for row in rows
+        }
+        return {
+            "events": events,
+            "waiting": sum(row.waiting for row in rows),
+            "admitted": sum(row.admitted for row in rows),
+            "completed": sum(row.completed for row in rows),
+        }
+
+admission_queue = AdmissionQueue(ADMISSION_WINDOW_SECONDS, ADMISSION_MAX_WAITING)
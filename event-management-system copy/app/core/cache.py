@@ -0,0 +1,103 @@
+"""
+Bounded in-process caches.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache whose entries expire after a TTL.
+
+    When full, the least recently used entry is evicted. With ``max_bytes``
+    the entries' declared sizes are capped as well. Hits, misses and
+    evictions are counted so the cache can be monitored.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: int = 0):
+        """
+        Store ``value`` under ``key`` for ``ttl`` seconds (the cache TTL by
+        default). ``size`` counts towards ``max_bytes``; a value larger than
+        the whole cap is not stored.
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (expires, value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key: Hashable):
+        """Drop ``key`` from the cache if present."""
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry for which ``predicate(key, value)`` holds; returns how many."""
+        with self._lock:
+            keys = [key for key, entry in self._data.items() if predicate(key, entry[1])]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+            if self.max_bytes is not None:
+                stats["bytes"] = self._bytes
+                stats["max_bytes"] = self.max_bytes
+            return stats
+
+    def _remove(self, key: Hashable):
+        # Callers hold the lock
+        self._bytes -= self._data.pop(key)[2]
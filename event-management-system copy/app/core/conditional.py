@@ -0,0 +1,74 @@
+"""
+Conditional GET support.
+
+Handlers compute a validator (a strong ETag and, where known, a Last-Modified
+time) from version counters before running their query. A request whose
+``If-None-Match`` or ``If-Modified-Since`` still matches is answered with an
+empty 304 without loading or serializing anything.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response, status
+
+def etag(*parts) -> str:
+    """A strong ETag built from the given version parts."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+def representation_tag(*models) -> str:
+    """
+    A short hash of the response schemas, part of every ETag so clients do not
+    keep a cached body across a deploy that changes its shape.
+    """
+    schemas = json.dumps([model.model_json_schema() for model in models], sort_keys=True)
+    return hashlib.sha1(schemas.encode()).hexdigest()[:8]
+
+def latest(times: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    """The most recent of the given times, ignoring unknown ones."""
+    known = [value for value in times if value is not None]
+    return max(known) if known else None
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def is_not_modified(request: Request, tag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether the client's cached copy is still current (RFC 9110, section 13.1)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as required for If-None-Match
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or any(candidate.removeprefix("W/") == tag for candidate in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds, and the header names the second a change
+    # was made in: round up, so a later change within that second is not missed
+    if last_modified.microsecond:
+        last_modified = last_modified.replace(microsecond=0) + timedelta(seconds=1)
+    return last_modified.replace(tzinfo=timezone.utc) <= since
+
+def validators(tag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """The validator headers, asking clients to revalidate before reusing a response."""
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+def set_validators(response: Response, tag: str, last_modified: Optional[datetime] = None):
+    """Attach the validator headers to a response."""
+    response.headers.update(validators(tag, last_modified))
+
+def not_modified(tag: str, last_modified: Optional[datetime] = None) -> Response:
+    """An empty 304 response carrying the current validators."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators(tag, last_modified))
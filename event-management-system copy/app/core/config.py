@@ -0,0 +1,74 @@
+"""
+Application settings.
+
+Every setting can be overridden with an environment variable of the same name.
+"""
+
+import os
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+# Logging (records are written by a background thread, see app/core/logging_setup.py)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "%(asctime)s %(levelname)s %(name)s: %(message)s")
+LOG_QUEUE_MAX_RECORDS = _int("LOG_QUEUE_MAX_RECORDS", 10000)
+
+# Authenticated user cache
+AUTH_CACHE_TTL_SECONDS = _float("AUTH_CACHE_TTL_SECONDS", 60.0)
+AUTH_CACHE_MAX_ENTRIES = _int("AUTH_CACHE_MAX_ENTRIES", 10000)
+
+# Password hashing process pool
+HASHING_WORKERS = _int("HASHING_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+HASHING_MAX_PENDING = _int("HASHING_MAX_PENDING", 64)
+
+# Database
+DATABASE_PATH = os.getenv("DATABASE_PATH", "./event_management.db")
+DB_POOL_SIZE = _int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _float("DB_POOL_TIMEOUT", 30.0)
+
+# SQLite connection pragmas
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = _int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_CACHE_SIZE_KB = _int("SQLITE_CACHE_SIZE_KB", 65536)
+SQLITE_MMAP_SIZE = _int("SQLITE_MMAP_SIZE", 268435456)
+
+# Write transactions that hit a locked database
+DB_LOCK_RETRIES = _int("DB_LOCK_RETRIES", 5)
+DB_LOCK_BACKOFF_SECONDS = _float("DB_LOCK_BACKOFF_SECONDS", 0.05)
+
+# Flash-sale admission queue
+ADMISSION_WINDOW_SECONDS = _float("ADMISSION_WINDOW_SECONDS", 120.0)
+ADMISSION_MAX_WAITING = _int("ADMISSION_MAX_WAITING", 10000)
+
+# Cache invalidations are shared between worker processes through a log table
+CACHE_INVALIDATION_POLL_MS = _float("CACHE_INVALIDATION_POLL_MS", 500.0)
+CACHE_INVALIDATION_RETENTION_SECONDS = _float("CACHE_INVALIDATION_RETENTION_SECONDS", 3600.0)
+
+# Cached table versions are dropped through the invalidation log; the TTL only
+# bounds staleness if a worker stops polling it
+TABLE_VERSION_CACHE_TTL_SECONDS = _float("TABLE_VERSION_CACHE_TTL_SECONDS", 60.0)
+
+# Cached JSON bodies of the category and event read endpoints
+RESPONSE_CACHE_TTL_SECONDS = _float("RESPONSE_CACHE_TTL_SECONDS", 60.0)
+RESPONSE_CACHE_MAX_ENTRIES = _int("RESPONSE_CACHE_MAX_ENTRIES", 5000)
+RESPONSE_CACHE_MAX_BYTES = _int("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Group commit of check-ins; each worker appends its process ID to the log path
+CHECKIN_LOG_PATH = os.getenv("CHECKIN_LOG_PATH", DATABASE_PATH + "-checkins.log")
+CHECKIN_FLUSH_INTERVAL_MS = _float("CHECKIN_FLUSH_INTERVAL_MS", 50.0)
+CHECKIN_FLUSH_MAX_RECORDS = _int("CHECKIN_FLUSH_MAX_RECORDS", 500)
+
+# Signed ticket codes stay valid this long after their event ends
+TICKET_CODE_GRACE_SECONDS = _float("TICKET_CODE_GRACE_SECONDS", 86400.0)
+
+# Rows fetched from the database per batch while streaming an export
+EXPORT_BATCH_ROWS = _int("EXPORT_BATCH_ROWS", 1000)
+
+# Admin statistics
+STATS_RECONCILE_INTERVAL_SECONDS = _float("STATS_RECONCILE_INTERVAL_SECONDS", 300.0)
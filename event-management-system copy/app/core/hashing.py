@@ -0,0 +1,111 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow (hundreds of milliseconds of CPU per call). Running
+it inline in an ``async def`` handler blocks the whole event loop, so hashing
+and verification are sent to a bounded process pool instead. When more calls
+are waiting than the pool is allowed to queue, new ones are rejected
+immediately rather than piling up behind a login storm.
+
+The pool's processes are started from a fork server (or spawned where that is
+not available) rather than forked from the server process: by the time the
+pool starts lazily, the server runs several threads, and a forked child could
+inherit a lock one of them was holding.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+# Password context for hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def hash_password(password: str) -> str:
+    """Hash a password synchronously (for scripts and pool workers)."""
+    return pwd_context.hash(password)
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password synchronously (for scripts and pool workers)."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _start_method() -> str:
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+class HashingQueueFull(Exception):
+    """Raised when the hashing pool already has its maximum number of calls waiting."""
+
+class HashingPool:
+    """A lazily started process pool with a cap on in-flight hashing calls."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.restarts = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(_start_method())
+                )
+            return self._executor
+
+    async def run(self, fn, *args):
+        """Run ``fn(*args)`` in the pool, or raise HashingQueueFull if saturated."""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HashingQueueFull()
+            self.pending += 1
+        try:
+            executor = self._get_executor()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                # A worker died: drop the pool so that the next call starts a new one
+                self._discard(executor)
+                raise
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is not executor:
+                # Another call replaced it already
+                return
+            self._executor = None
+            self.restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """Stop the worker processes, if they were started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Queue depth and throughput counters."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "restarts": self.restarts,
+            }
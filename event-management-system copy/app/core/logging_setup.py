@@ -0,0 +1,77 @@
+"""
+Process-wide logging configuration.
+
+Request handlers only put records on an in-memory queue; a ``QueueListener``
+thread formats them and does the actual writes, so a slow terminal or disk
+never holds up the event loop. The queue is bounded: when the writer cannot
+keep up, further records are dropped and counted rather than blocking
+requests or growing memory without limit.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import LOG_FORMAT, LOG_LEVEL, LOG_QUEUE_MAX_RECORDS
+
+# Loggers that servers such as uvicorn give handlers of their own
+SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+class DroppingQueueHandler(QueueHandler):
+    """A QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+def setup_logging(level: str = LOG_LEVEL):
+    """
+    Route all logging through the background writer. Safe to call more than
+    once; later calls only change the level.
+    """
+    global _listener, _queue_handler
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    _queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_MAX_RECORDS))
+    root.handlers = [_queue_handler]
+    for name in SERVER_LOGGERS:
+        logger = logging.getLogger(name)
+        if logger.handlers:
+            logger.handlers = [_queue_handler]
+
+    _listener = QueueListener(_queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Write out the records still queued and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def logging_stats() -> dict:
+    """Current level, queue depth and records dropped because the queue was full."""
+    return {
+        "level": logging.getLevelName(logging.getLogger().level),
+        "queued": _queue_handler.queue.qsize() if _queue_handler is not None else 0,
+        "max_queued": LOG_QUEUE_MAX_RECORDS,
+        "dropped": _queue_handler.dropped if _queue_handler is not None else 0,
+    }
@@ -0,0 +1,146 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by ``(sort column, id)`` and a page continues from the
+last row of the previous one with a row-value comparison, so the database can
+seek straight to it through an index instead of skipping ``offset`` rows.
+The position is handed to clients as an opaque, URL-safe cursor.
+
+A row-value comparison with NULL is never true, so on a nullable sort column
+the seek predicate handles NULLs explicitly (SQLite orders them before every
+value) instead of dropping those rows or repeating them when a page ends on
+one. The extra ``OR`` keeps the index from seeking on descending pages, so
+columns that large listings sort by are declared NOT NULL instead.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, tuple_
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class Keyset:
+    """A parsed sort specification plus an optional cursor to resume from."""
+
+    def __init__(self, sort: str, column, id_column, descending: bool, after=None):
+        self.sort = sort
+        self.column = column
+        self.id_column = id_column
+        self.descending = descending
+        self.after = after
+
+    def apply(self, query):
+        """Add the ORDER BY, and the seek predicate when resuming from a cursor."""
+        if self.column is self.id_column:
+            if self.after is not None:
+                last_id = self.after[0]
+                query = query.where(self.id_column < last_id if self.descending else self.id_column > last_id)
+            order = [self.id_column.desc() if self.descending else self.id_column]
+        else:
+            if self.after is not None:
+                query = query.where(self._seek(*self.after))
+            if self.descending:
+                order = [self.column.desc(), self.id_column.desc()]
+            else:
+                order = [self.column, self.id_column]
+        return query.order_by(*order)
+
+    def _seek(self, value, last_id):
+        # Rows after (value, last_id) in the listing order, NULLs sorting first
+        if value is None:
+            if self.descending:
+                return and_(self.column.is_(None), self.id_column < last_id)
+            return or_(self.column.is_not(None), and_(self.column.is_(None), self.id_column > last_id))
+        position = tuple_(self.column, self.id_column)
+        if not self.descending:
+            return position > (value, last_id)
+        if self.column.nullable:
+            return or_(position < (value, last_id), self.column.is_(None))
+        return position < (value, last_id)
+
+    def next_cursor(self, rows, limit: int) -> Optional[str]:
+        """Cursor for the page after ``rows``, or None if this was the last page."""
+        if not rows or len(rows) < limit:
+            return None
+        last = rows[-1]
+        values = [getattr(last, self.id_column.key)]
+        if self.column is not self.id_column:
+            values.insert(0, getattr(last, self.column.key))
+        return encode_cursor(self.sort, values)
+
+def encode_cursor(sort: str, values) -> str:
+    """Pack a sort specification and the last row's sort values into an opaque token."""
+    payload = [sort] + [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _invalid_cursor():
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor"
+    )
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+    if not isinstance(payload, list) or len(payload) < 2:
+        raise _invalid_cursor()
+    return payload[0], payload[1:]
+
+def _cursor_value(column, value):
+    # A cursor comes from the client: accept only a scalar of the column's type
+    if value is None:
+        if not column.nullable:
+            raise _invalid_cursor()
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise _invalid_cursor()
+    if isinstance(value, bool):
+        raise _invalid_cursor()
+    if python_type is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, python_type):
+        raise _invalid_cursor()
+    return value
+
+def keyset(sort: Optional[str], cursor: Optional[str], columns: Dict[str, object], id_column, default: str = "id") -> Keyset:
+    """
+    Build a Keyset from ``sort`` and ``cursor`` query parameters.
+
+    ``sort`` is one of the keys of ``columns``, optionally prefixed with ``-``
+    for descending order. The cursor must have been issued for the same sort.
+    """
+    sort = sort or default
+    descending = sort.startswith("-")
+    sort_key = sort.lstrip("-")
+    if sort_key not in columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid sort field. Allowed: {', '.join(sorted(columns))}"
+        )
+    column = columns[sort_key]
+
+    after = None
+    if cursor:
+        cursor_sort, values = _decode_cursor(cursor)
+        expected = 1 if column is id_column else 2
+        if cursor_sort != sort or len(values) != expected:
+            raise _invalid_cursor()
+        values[-1] = _cursor_value(id_column, values[-1])
+        if column is not id_column:
+            values[0] = _cursor_value(column, values[0])
+        after = values
+
+    return Keyset(sort, column, id_column, descending, after)
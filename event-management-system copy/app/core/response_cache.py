@@ -0,0 +1,71 @@
+"""
+In-process cache of serialized read responses.
+
+Category and event reads are cached as finished JSON bodies, so a hit skips
+both the query and the Pydantic serialization. Keys are
+``(resource, identity, etag)``, where the identity is the resource ID or the
+listing's validated parameters (see ``params_key``), so query parameters an
+endpoint does not accept cannot multiply entries. Because the ETag comes from
+the version counters, an entry can never be served once its resource has
+changed; writers still publish invalidations for the entries they affect (see
+``app.db.invalidation``) so stale bodies do not hold memory in any worker.
+
+Entries are evicted least recently used first once either the entry or the
+byte limit is reached, and expire after a TTL.
+"""
+
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, NamedTuple, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.core.cache import TTLCache
+from app.core.config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+from app.core.serialization import dump_json
+from app.db.invalidation import register_channel
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+    # Other resources embedded in the body, as (resource, id) pairs
+    related: FrozenSet[Hashable] = frozenset()
+
+response_cache = TTLCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_BYTES)
+
+def params_key(**params) -> tuple:
+    """Identity of a listing from its parsed parameters, in a fixed order and without unset ones."""
+    return tuple((name, params[name]) for name in sorted(params) if params[name] is not None)
+
+def cached_response(key: tuple) -> Optional[Response]:
+    """The cached response for ``key``, if any."""
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+    return Response(entry.body, media_type="application/json", headers=entry.headers)
+
+def cache_response(
+    key: tuple,
+    adapter: TypeAdapter,
+    content: Any,
+    headers: Dict[str, str],
+    related: Iterable[Hashable] = (),
+    from_attributes: bool = True
+) -> Response:
+    """Serialize ``content`` through ``adapter``, cache the body under ``key`` and return it."""
+    body = dump_json(adapter, content, from_attributes)
+    entry = CachedResponse(body, dict(headers), frozenset(related))
+    response_cache.set(key, entry, size=len(body))
+    return Response(body, media_type="application/json", headers=entry.headers)
+
+def invalidate_responses(resource: str, resource_id: Optional[int] = None) -> int:
+    """
+    Drop the cached responses of a resource: every entry of a listing, or
+    with ``resource_id`` the entries of one item and those embedding it.
+    """
+    if resource_id is None:
+        return response_cache.delete_where(lambda key, entry: key[0] == resource)
+    return response_cache.delete_where(
+        lambda key, entry: key[:2] == (resource, resource_id) or (resource, resource_id) in entry.related
+    )
+
+register_channel("responses", invalidate_responses, response_cache.clear)
@@ -1,20 +1,23 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import time
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import logging
 
 # Will be imported later when models are created
 from app.models.user import User
 from app.schemas.token import TokenData
+from app.schemas.user import UserResponse
 from app.db.base import get_db
+from app.core.cache import TTLCache
+from app.core.config import AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS, HASHING_MAX_PENDING, HASHING_WORKERS
+from app.core.hashing import HashingPool, HashingQueueFull, check_password, hash_password
+from app.db.invalidation import register_channel
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 # Security constants
@@ -22,19 +25,43 @@ SECRET_KEY = "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password context for hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Process pool for bcrypt, so hashing never blocks the event loop
+hashing_pool = HashingPool(workers=HASHING_WORKERS, max_pending=HASHING_MAX_PENDING)
 
 # OAuth2 password bearer
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Verified token claims (keyed by token) and user snapshots (keyed by user id),
+# so authenticated requests don't decode the JWT and query the user every time
+token_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+# Drop a cached user snapshot; writers publish a "users" invalidation instead,
+# which calls this in every worker
+def invalidate_user(user_id: int):
+    user_cache.delete(user_id)
+
+register_channel("users", lambda name, user_id: invalidate_user(user_id), user_cache.clear)
+
+# Run a hashing call in the pool, failing fast when it is saturated
+async def _run_hashing(fn, *args):
+    try:
+        return await hashing_pool.run(fn, *args)
+    except HashingQueueFull:
+        logger.warning("Password hashing queue is full, rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
 # Verify password
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await _run_hashing(check_password, plain_password, hashed_password)
 
 # Generate password hash
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await _run_hashing(hash_password, password)
 
 # Create access token
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -48,18 +75,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 # User authentication
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return False
     return user
 
 # Current user dependency
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     logger.debug("Attempting to validate user token")
     
@@ -77,37 +104,48 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        logger.debug(f"Decoding token: {token[:10]}...{token[-10:] if len(token) > 20 else ''}")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        user_id: int = payload.get("user_id")
-        role: str = payload.get("role")
-        
-        logger.debug(f"Token payload - email: {email}, user_id: {user_id}, role: {role}")
-        
-        if email is None or user_id is None:
-            logger.error("Token missing required fields")
-            raise credentials_exception
+    token_data = token_cache.get(token)
+    if token_data is None:
+        try:
+            logger.debug("Decoding token")
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            email: str = payload.get("sub")
+            user_id: int = payload.get("user_id")
+            role: str = payload.get("role")
             
-        token_data = TokenData(email=email, user_id=user_id, role=role)
-    except JWTError as e:
-        logger.error(f"JWT Error: {str(e)}")
-        raise credentials_exception
-    
-    logger.debug(f"Looking up user with ID: {token_data.user_id}")
-    user = db.execute(select(User).where(User.id == token_data.user_id)).scalar_one_or_none()
+            logger.debug("Token payload - user_id: %s, role: %s", user_id, role)
+            
+            if email is None or user_id is None:
+                logger.error("Token missing required fields")
+                raise credentials_exception
+                
+            token_data = TokenData(email=email, user_id=user_id, role=role)
+        except JWTError as e:
+            logger.error("JWT Error: %s", e)
+            raise credentials_exception
+        
+        # Never keep claims around past the token's own expiry
+        expires_at = payload.get("exp")
+        token_cache.set(token, token_data, ttl=expires_at - time.time() if expires_at else None)
     
+    user = user_cache.get(token_data.user_id)
     if user is None:
-        logger.error(f"User with ID {token_data.user_id} not found in database")
-        raise credentials_exception
+        logger.debug("Looking up user with ID: %s", token_data.user_id)
+        db_user = (await db.execute(select(User).where(User.id == token_data.user_id))).scalar_one_or_none()
+        
+        if db_user is None:
+            logger.error("User with ID %s not found in database", token_data.user_id)
+            raise credentials_exception
+        
+        user = UserResponse.model_validate(db_user)
+        user_cache.set(user.id, user)
         
-    logger.debug(f"Successfully authenticated user: {user.email}")
+    logger.debug("Successfully authenticated user ID: %s", user.id)
     return user
 
 # Check if user is active dependency
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_current_user)
 ):
     if not current_user.is_active:
         raise HTTPException(
@@ -118,7 +156,7 @@ async def get_current_active_user(
 
 # Check if user is admin dependency
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserResponse = Depends(get_current_active_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -129,7 +167,7 @@ async def get_current_admin_user(
 
 # Check if user is admin for event management
 async def get_current_event_manager_user(
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserResponse = Depends(get_current_active_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(
@@ -0,0 +1,39 @@
+"""
+Fast JSON encoding of response schemas.
+
+Handlers on hot paths encode their responses themselves: they validate the
+content once through a ``TypeAdapter`` built at import time and dump it
+straight to JSON bytes with Pydantic's compiled serializer, then return the
+bytes as they are. List endpoints read plain column rows rather than ORM
+objects for this; validating dicts is several times cheaper than reading
+every field off a mapped instance.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+def dump_json(adapter: TypeAdapter, content: Any, from_attributes: bool = True) -> bytes:
+    """Validate ``content`` against the adapter's type and encode it as the API does."""
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=from_attributes), by_alias=True)
+
+@lru_cache(maxsize=256)
+def sparse_list_adapter(
+    model: Type[BaseModel],
+    fields: Tuple[str, ...],
+    nested: Tuple[Tuple[str, Type[BaseModel]], ...] = ()
+) -> TypeAdapter:
+    """
+    Adapter for a list of ``model`` reduced to ``fields`` (in that order), plus
+    optional nested objects given as ``(name, schema)`` pairs.
+    """
+    definitions = {name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    for name, schema in nested:
+        definitions[name] = (Optional[schema], None)
+    return TypeAdapter(List[create_model(model.__name__ + "Fields", **definitions)])
+
+def records(keys: Iterable[str], rows: Sequence) -> List[dict]:
+    """Result rows as dicts keyed by column name."""
+    keys = list(keys)
+    return [dict(zip(keys, row)) for row in rows]
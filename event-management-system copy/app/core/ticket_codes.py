@@ -0,0 +1,68 @@
+"""
+Signed ticket codes that gate scanners can verify offline.
+
+A code packs the event id, registration id and expiry (Unix seconds) together
+with a truncated HMAC-SHA256 over them into 31 URL-safe characters:
+
+    base64url(version:1 | event_id:4 | registration_id:4 | expires:4 | mac:10)
+
+The HMAC key is derived from the application's ``SECRET_KEY`` separately for
+every event, so a scanner is only ever given the key of the event it guards
+and cannot mint codes for any other event.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+from app.core.security import SECRET_KEY
+
+CODE_VERSION = 1
+MAC_LENGTH = 10
+_PAYLOAD = struct.Struct(">BIII")
+
+class TicketClaims(NamedTuple):
+    event_id: int
+    registration_id: int
+    expires_at: datetime
+
+    def is_expired(self, at: Optional[datetime] = None) -> bool:
+        return (at or datetime.utcnow()) >= self.expires_at
+
+def event_signing_key(event_id: int) -> bytes:
+    """HMAC key for the ticket codes of one event."""
+    return hmac.new(SECRET_KEY.encode(), f"ticket-codes:{event_id}".encode(), hashlib.sha256).digest()
+
+def _to_timestamp(value: datetime) -> int:
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+def create_ticket_code(event_id: int, registration_id: int, expires_at: datetime) -> str:
+    """Sign a ticket code for a registration, valid until ``expires_at`` (naive UTC)."""
+    payload = _PAYLOAD.pack(CODE_VERSION, event_id, registration_id, _to_timestamp(expires_at))
+    mac = hmac.new(event_signing_key(event_id), payload, hashlib.sha256).digest()[:MAC_LENGTH]
+    return base64.urlsafe_b64encode(payload + mac).decode().rstrip("=")
+
+def verify_ticket_code(code: str) -> Optional[TicketClaims]:
+    """
+    Return the claims of a correctly signed code, or None if the code is
+    malformed, forged or in another format. Expiry is left to the caller.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) != _PAYLOAD.size + MAC_LENGTH:
+        return None
+    payload, mac = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+    version, event_id, registration_id, expires = _PAYLOAD.unpack(payload)
+    if version != CODE_VERSION:
+        return None
+    expected = hmac.new(event_signing_key(event_id), payload, hashlib.sha256).digest()[:MAC_LENGTH]
+    if not hmac.compare_digest(mac, expected):
+        return None
+    expires_at = datetime.fromtimestamp(expires, tz=timezone.utc).replace(tzinfo=None)
+    return TicketClaims(event_id, registration_id, expires_at)
@@ -1,8 +1,56 @@
 # This file is intentionally empty to make the directory a Python package 
 
-def run_migrations():
-    """Run all database migrations."""
+def _migrations():
+    """Every migration, in order (the position in this list is the schema version)."""
     from app.db.migrations.remove_image_url import migrate as remove_image_url
+    from app.db.migrations.add_event_search_index import migrate as add_event_search_index
+    from app.db.migrations.add_event_filter_indexes import migrate as add_event_filter_indexes
+    from app.db.migrations.add_event_counters import migrate as add_event_counters
+    from app.db.migrations.add_order_indexes import migrate as add_order_indexes
+    from app.db.migrations.add_site_stats import migrate as add_site_stats
+    from app.db.migrations.add_event_admission_rate import migrate as add_event_admission_rate
+    from app.db.migrations.add_registration_indexes import migrate as add_registration_indexes
+    from app.db.migrations.add_resource_versions import migrate as add_resource_versions
+    from app.db.migrations.add_cache_invalidations import migrate as add_cache_invalidations
+    from app.db.migrations.add_unique_registrations import migrate as add_unique_registrations
+    from app.db.migrations.add_event_sort_indexes import migrate as add_event_sort_indexes
+    from app.db.migrations.add_admission_tables import migrate as add_admission_tables
+    from app.db.migrations.require_event_sort_values import migrate as require_event_sort_values
     
-    # Run migrations in order
-    remove_image_url() 
\ No newline at end of file
+    return [
+        remove_image_url,
+        add_event_search_index,
+        add_event_filter_indexes,
+        add_event_counters,
+        add_order_indexes,
+        add_site_stats,
+        add_event_admission_rate,
+        add_registration_indexes,
+        add_resource_versions,
+        add_cache_invalidations,
+        add_unique_registrations,
+        add_event_sort_indexes,
+        add_admission_tables,
+        require_event_sort_values,
+    ]
+
+def run_migrations():
+    """
+    Run all pending database migrations.
+    
+    Not safe to run from several processes at once: call it from a single
+    pre-start step (run.py or run_migrations.py), never from the workers.
+    """
+    from app.db.migrations import apply_migrations, refresh_statistics
+    apply_migrations(_migrations())
+    refresh_statistics()
+
+def check_migrations():
+    """Refuse to serve from a database whose schema is older than the code."""
+    from app.db.migrations import get_schema_version
+    current, expected = get_schema_version(), len(_migrations())
+    if current < expected:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {expected}. "
+            "Run `python run_migrations.py` before starting the server."
+        )
@@ -1,16 +1,73 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-# Create SQLite database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./event_management.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+from app.core.config import (
+    DATABASE_PATH,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+)
+
+# SQLite database
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers keep going while a writer commits; the rest trade a
+    # little durability on power loss for far fewer fsyncs and a warm cache
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+def _pool_options(url: str) -> dict:
+    # In-memory databases live in a single connection and have no pool to size
+    if url.rstrip("/").endswith(":memory:") or url.endswith("://"):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+    }
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL):
+    """Create a sync engine with the tuned SQLite settings applied on connect."""
+    db_engine = create_engine(url, connect_args={"check_same_thread": False}, **_pool_options(url))
+    event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+def create_async_db_engine(url: str = ASYNC_SQLALCHEMY_DATABASE_URL):
+    """Create an async engine with the tuned SQLite settings applied on connect."""
+    db_engine = create_async_engine(url, **_pool_options(url))
+    event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+# Sync engine, used by migrations and scripts such as seed_data.py
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine, used by the API so database waits never block the event loop
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Group commit for check-ins.
+
+Committing every scan on its own makes SQLite write once per attendee, which
+is what limits check-in throughput when the doors open. Scans are instead held
+in memory and appended to a log file, and a background task writes them to the
+database in batches, one transaction every ``flush_interval`` seconds or as
+soon as ``max_batch`` scans are waiting.
+
+Whether a ticket was already checked in is decided by the database, not by the
+worker that took the scan: the batch UPDATE only matches registrations that are
+not checked in yet, and a scan is answered once its batch has committed, with
+a conflict if its registration was not among the rows updated. Two gates served
+by different workers therefore cannot both admit the same ticket.
+
+Every process writes its own log (the process ID is appended to
+``CHECKIN_LOG_PATH``). The log is rotated into a segment before every flush
+and the segment is only deleted once its scans are committed. On startup a
+worker adopts the logs and segments of processes that are no longer running
+and replays them, so a logged scan survives a process crash.
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, case, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import CHECKIN_FLUSH_INTERVAL_MS, CHECKIN_FLUSH_MAX_RECORDS, CHECKIN_LOG_PATH
+from app.db.base import AsyncSessionLocal
+from app.db.retry import run_with_retry
+from app.models.registration import Registration
+
+logger = logging.getLogger(__name__)
+
+async def mark_checked_in(db: AsyncSession, check_ins: List[dict]):
+    """
+    Check in registrations with one executemany UPDATE. Each item carries a
+    ``registration_id`` and a ``checked_in_time``; an earlier time already
+    stored is kept.
+    """
+    registrations = Registration.__table__
+    checked_in_time = bindparam("checked_in_time", type_=registrations.c.checked_in_time.type)
+    await db.execute(
+        update(registrations)
+        .where(registrations.c.id == bindparam("registration_id"))
+        .values(
+            checked_in=True,
+            checked_in_time=case(
+                (registrations.c.checked_in_time.is_(None), checked_in_time),
+                (registrations.c.checked_in_time > checked_in_time, checked_in_time),
+                else_=registrations.c.checked_in_time
+            )
+        ),
+        check_ins
+    )
+
+async def claim_check_ins(db: AsyncSession, check_ins: Dict[int, datetime]) -> set:
+    """
+    Check in those of the given registrations that are not checked in yet and
+    return their IDs; the others were checked in already.
+    """
+    registrations = Registration.__table__
+    result = await db.execute(
+        update(registrations)
+        .where(registrations.c.id.in_(check_ins), registrations.c.checked_in == False)  # noqa: E712
+        .values(checked_in=True, checked_in_time=case(check_ins, value=registrations.c.id))
+        .returning(registrations.c.id)
+    )
+    return set(result.scalars())
+
+def _process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # Signal 0 is not a liveness probe on Windows: treat other processes as alive
+        return pid != os.getpid()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class CheckInBuffer:
+    """Pending check-ins in memory, backed by an append-only log per process."""
+
+    def __init__(self, log_path: str, flush_interval: float, max_batch: int):
+        self.base_path = log_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.pending: Dict[int, Tuple[int, datetime]] = {}
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._log = None
+        self._segments: List[str] = []
+        self._next_segment = 0
+        self._full = asyncio.Event()
+        self.recorded = 0
+        self.flushed = 0
+        self.duplicates = 0
+        self.batches = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def log_path(self) -> str:
+        # Resolved on use, so a buffer inherited by a forked worker gets its own log
+        return f"{self.base_path}.{os.getpid()}"
+
+    async def record(self, registration_id: int, event_id: int, checked_in_time: datetime) -> bool:
+        """
+        Log a check-in and wait for its batch to commit. False if the
+        registration was already checked in, here or by another worker.
+        """
+        if registration_id in self.pending:
+            return False
+        if self._log is None:
+            self._open_log()
+        line = json.dumps([registration_id, event_id, checked_in_time.isoformat()]) + "\n"
+        os.write(self._log, line.encode())
+        self.pending[registration_id] = (event_id, checked_in_time)
+        waiter = self._waiters[registration_id] = asyncio.get_running_loop().create_future()
+        self.recorded += 1
+        if len(self.pending) >= self.max_batch:
+            self._full.set()
+        return await asyncio.shield(waiter)
+
+    def pending_time(self, registration_id: int) -> Optional[datetime]:
+        """Check-in time of a registration that is not flushed yet, if any."""
+        entry = self.pending.get(registration_id)
+        return entry[1] if entry else None
+
+    def replay(self):
+        """Adopt and load the logs left behind by processes that are no longer running."""
+        orphans = []
+        for path in glob.glob(glob.escape(self.base_path) + ".*"):
+            # <base>.<pid> is a live log, <base>.<pid>.<n> one of its segments
+            parts = path[len(self.base_path) + 1:].split(".")
+            if len(parts) > 2 or not all(part.isdigit() for part in parts):
+                continue
+            if int(parts[0]) == os.getpid() or not _process_alive(int(parts[0])):
+                orphans.append((int(parts[0]), len(parts) == 1, int(parts[-1]) if len(parts) == 2 else 0, path))
+
+        # Number new segments past this process ID's leftovers, so none is overwritten
+        self._next_segment = max(
+            [number for pid, is_log, number, _ in orphans if pid == os.getpid() and not is_log], default=0
+        )
+        for _, _, _, path in sorted(orphans):
+            segment = self._segment_path()
+            try:
+                # Renaming is atomic, so a log is adopted by one worker only
+                os.replace(path, segment)
+            except FileNotFoundError:
+                continue
+            self._segments.append(segment)
+
+        replayed = {}
+        for segment in self._segments:
+            with open(segment) as log:
+                for line in log:
+                    try:
+                        registration_id, event_id, checked_in_time = json.loads(line)
+                        checked_in_time = datetime.fromisoformat(checked_in_time)
+                    except ValueError:
+                        # A write cut short by the crash
+                        continue
+                    current = replayed.get(registration_id)
+                    if current is None or checked_in_time < current[1]:
+                        replayed[registration_id] = (event_id, checked_in_time)
+        self._requeue(replayed)
+        if self._segments:
+            logger.info("Replayed %d pending check-ins from %d log segments", len(replayed), len(self._segments))
+
+    async def flush(self) -> int:
+        """Write all pending check-ins to the database in one transaction."""
+        if not self.pending:
+            return 0
+        batch, self.pending = self.pending, {}
+        waiters, self._waiters = self._waiters, {}
+        self._rotate()
+        started = time.perf_counter()
+        registration_ids = list(batch)
+
+        async def write():
+            claimed = set()
+            for start in range(0, len(registration_ids), self.max_batch):
+                chunk = registration_ids[start:start + self.max_batch]
+                claimed |= await claim_check_ins(db, {registration_id: batch[registration_id][1] for registration_id in chunk})
+            await db.commit()
+            return claimed
+
+        try:
+            async with AsyncSessionLocal() as db:
+                claimed = await run_with_retry(db, write)
+        except asyncio.CancelledError:
+            self._requeue(batch, waiters)
+            raise
+        except Exception:
+            self.failed_flushes += 1
+            logger.exception("Flushing %d check-ins failed, keeping them for the next flush", len(batch))
+            self._requeue(batch, waiters)
+            return 0
+
+        for registration_id, waiter in waiters.items():
+            if not waiter.done():
+                waiter.set_result(registration_id in claimed)
+        for segment in self._segments:
+            os.remove(segment)
+        self._segments = []
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushed += len(claimed)
+        self.duplicates += len(batch) - len(claimed)
+        self.batches += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        return len(batch)
+
+    async def run(self):
+        """Background task: flush on every interval, or early when a batch is full."""
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
+
+    async def close(self):
+        """Flush what is left and close the log."""
+        await self.flush()
+        for waiter in self._waiters.values():
+            # Still logged, so the next worker to start replays these scans
+            waiter.cancel()
+        if self._log is not None:
+            os.close(self._log)
+            self._log = None
+
+    def stats(self) -> dict:
+        """Queue depth, throughput and flush latency."""
+        return {
+            "queue_depth": len(self.pending),
+            "max_batch": self.max_batch,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "duplicates": self.duplicates,
+            "batches": self.batches,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.batches, 2) if self.batches else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "log_segments": len(self._segments),
+        }
+
+    def _requeue(
+        self,
+        batch: Dict[int, Tuple[int, datetime]],
+        waiters: Optional[Dict[int, asyncio.Future]] = None,
+    ):
+        # The segments stay on disk until a flush succeeds
+        for registration_id, entry in batch.items():
+            current = self.pending.get(registration_id)
+            if current is None or entry[1] < current[1]:
+                self.pending[registration_id] = entry
+        self._waiters.update(waiters or {})
+
+    def _open_log(self):
+        self._log = os.open(self.log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+
+    def _segment_path(self) -> str:
+        self._next_segment += 1
+        return f"{self.log_path}.{self._next_segment}"
+
+    def _rotate(self):
+        # Scans recorded from now on go to a fresh log
+        if self._log is None:
+            return
+        os.close(self._log)
+        self._log = None
+        self._segments.append(self._segment_path())
+        os.replace(self.log_path, self._segments[-1])
+
+checkin_buffer = CheckInBuffer(CHECKIN_LOG_PATH, CHECKIN_FLUSH_INTERVAL_MS / 1000, CHECKIN_FLUSH_MAX_RECORDS)
@@ -0,0 +1,102 @@
+"""
+Denormalized per-event counters.
+
+``Event.attendee_count`` mirrors the number of registrations and
+``Event.tickets_sold`` the sum of ``OrderItem.quantity`` for the event. Writers
+adjust them with a relative UPDATE in the same session (and therefore the same
+transaction) as the row they add or remove, so readers never have to count.
+
+Every counter write also bumps ``Event.version`` and ``Event.updated_at``, so
+an event's ETag changes whenever its seat counts do.
+
+Together the two counters are the seats taken out of ``Event.capacity``.
+Seats are reserved with a conditional UPDATE that only matches while enough
+of them are free, so the check and the increment are a single atomic step and
+concurrent checkouts cannot oversell an event.
+
+The adjust helpers take the API's AsyncSession; the bulk recomputation runs on a
+sync Session from migrations and scripts.
+"""
+
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.order import OrderItem
+from app.models.registration import Registration
+
+def _touched() -> dict:
+    # Values that mark a counter write as a change to the event
+    return {"version": Event.version + 1, "updated_at": datetime.utcnow()}
+
+async def adjust_attendee_count(db: AsyncSession, event_id: int, delta: int):
+    """Add ``delta`` (negative to remove) to an event's attendee count."""
+    await db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(attendee_count=Event.attendee_count + delta, **_touched())
+        .execution_options(synchronize_session=False)
+    )
+
+async def adjust_tickets_sold(db: AsyncSession, event_id: int, delta: int):
+    """Add ``delta`` (negative to release) to an event's sold ticket count."""
+    await db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(tickets_sold=Event.tickets_sold + delta, **_touched())
+        .execution_options(synchronize_session=False)
+    )
+
+def seats_left():
+    """SQL expression for an event's free seats (NULL when capacity is unlimited)."""
+    return Event.capacity - Event.attendee_count - Event.tickets_sold
+
+async def reserve_tickets(db: AsyncSession, quantities: Dict[int, int]) -> bool:
+    """
+    Add each event's quantity to its sold ticket count, but only if every event
+    has that many seats left. Returns False when at least one of them has not;
+    some events may then have been updated, so the caller must roll back.
+    """
+    delta = case(quantities, value=Event.id, else_=0)
+    result = await db.execute(
+        update(Event)
+        .where(Event.id.in_(quantities))
+        .where(or_(Event.capacity.is_(None), seats_left() >= delta))
+        .values(tickets_sold=Event.tickets_sold + delta, **_touched())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == len(quantities)
+
+async def reserve_attendee(db: AsyncSession, event_id: int) -> bool:
+    """Add one to an event's attendee count if it has a seat left; False otherwise."""
+    result = await db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .where(or_(Event.capacity.is_(None), seats_left() >= 1))
+        .values(attendee_count=Event.attendee_count + 1, **_touched())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def recompute_event_counters(db: Session):
+    """Recompute every event's counters from the source tables in one statement."""
+    attendees = (
+        select(func.count(Registration.id))
+        .where(Registration.event_id == Event.id)
+        .scalar_subquery()
+    )
+    sold = (
+        select(func.coalesce(func.sum(OrderItem.quantity), 0))
+        .where(OrderItem.event_id == Event.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Event)
+        .values(attendee_count=attendees, tickets_sold=sold)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,163 @@
+"""
+Cache invalidation shared between worker processes.
+
+Each worker keeps its own in-process caches (table versions, response bodies,
+user snapshots). A writer publishes the invalidations its change implies into
+the ``cache_invalidations`` log, in the same transaction as the change:
+
+* when the transaction commits, the writing worker drops the entries right
+  away, so it always reads its own writes;
+* every worker polls the log for rows newer than the last one it has seen and
+  drops the same entries, so other workers are stale for at most one poll
+  interval.
+
+SQLite has a single writer and the log's IDs are never reused, so rows become
+visible in ID order and a poll can never skip one. Rows are pruned after a
+retention period; a worker that finds rows missing since its last poll (it was
+suspended for longer than that) clears its caches entirely.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, NamedTuple, Optional
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import CACHE_INVALIDATION_POLL_MS, CACHE_INVALIDATION_RETENTION_SECONDS
+from app.db.base import AsyncSessionLocal
+from app.models.invalidation import CacheInvalidation
+
+logger = logging.getLogger(__name__)
+
+class Invalidation(NamedTuple):
+    channel: str
+    name: Optional[str] = None
+    item_id: Optional[int] = None
+
+class _Channel(NamedTuple):
+    drop: Callable[[Optional[str], Optional[int]], None]
+    clear: Callable[[], None]
+
+_channels: Dict[str, _Channel] = {}
+
+def register_channel(channel: str, drop: Callable[[Optional[str], Optional[int]], None], clear: Callable[[], None]):
+    """
+    Route invalidations of ``channel`` to a cache: ``drop(name, item_id)``
+    removes the entries one invalidation names, ``clear()`` removes them all.
+    """
+    _channels[channel] = _Channel(drop, clear)
+
+def apply_invalidation(invalidation: Invalidation):
+    """Drop the local cache entries named by an invalidation."""
+    channel = _channels.get(invalidation.channel)
+    if channel is None:
+        logger.warning("No cache registered for invalidation channel %s", invalidation.channel)
+        return
+    channel.drop(invalidation.name, invalidation.item_id)
+
+def clear_caches():
+    """Drop every entry of every registered cache."""
+    for channel in _channels.values():
+        channel.clear()
+
+async def publish_invalidations(db: AsyncSession, *invalidations: Invalidation):
+    """
+    Record invalidations in the writer's transaction. They take effect in this
+    worker when the transaction commits and in the others at their next poll.
+    """
+    if not invalidations:
+        return
+    now = datetime.utcnow()
+    await db.execute(
+        insert(CacheInvalidation),
+        [
+            {"channel": item.channel, "name": item.name, "item_id": item.item_id, "created_at": now}
+            for item in invalidations
+        ]
+    )
+    db.info.setdefault("invalidations", []).extend(invalidations)
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session):
+    for invalidation in session.info.pop("invalidations", ()):
+        apply_invalidation(invalidation)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session):
+    session.info.pop("invalidations", None)
+
+class InvalidationListener:
+    """Polls the invalidation log and applies other workers' invalidations."""
+
+    def __init__(self, poll_interval: float, retention: float):
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.last_id: Optional[int] = None
+        self.applied = 0
+        self.polls = 0
+        self.resets = 0
+        self.failed_polls = 0
+        self._last_prune = 0.0
+
+    async def poll(self) -> int:
+        """Apply every invalidation logged since the previous poll; returns how many."""
+        async with AsyncSessionLocal() as db:
+            if self.last_id is None:
+                # Caches start empty, so only later invalidations matter
+                self.last_id = (await db.execute(select(func.max(CacheInvalidation.id)))).scalar() or 0
+                return 0
+            rows = (await db.execute(
+                select(CacheInvalidation.id, CacheInvalidation.channel, CacheInvalidation.name, CacheInvalidation.item_id)
+                .where(CacheInvalidation.id > self.last_id)
+                .order_by(CacheInvalidation.id)
+            )).all()
+        self.polls += 1
+        if not rows:
+            return 0
+
+        if rows[0].id != self.last_id + 1:
+            logger.warning("Invalidations %d to %d were pruned before they were seen, clearing caches", self.last_id + 1, rows[0].id - 1)
+            self.resets += 1
+            clear_caches()
+        for row in rows:
+            apply_invalidation(Invalidation(row.channel, row.name, row.item_id))
+        self.last_id = rows[-1].id
+        self.applied += len(rows)
+        return len(rows)
+
+    async def prune(self):
+        """Delete log rows older than the retention period."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention)
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < cutoff))
+            await db.commit()
+
+    async def run(self):
+        """Background task: poll every interval, and prune now and then."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll()
+                if time.monotonic() - self._last_prune >= self.retention / 10:
+                    self._last_prune = time.monotonic()
+                    await self.prune()
+            except Exception:
+                self.failed_polls += 1
+                logger.exception("Polling the cache invalidation log failed")
+
+    def stats(self) -> dict:
+        """Position in the log and counters."""
+        return {
+            "last_id": self.last_id,
+            "poll_interval_ms": self.poll_interval * 1000,
+            "polls": self.polls,
+            "applied": self.applied,
+            "resets": self.resets,
+            "failed_polls": self.failed_polls,
+        }
+
+invalidation_listener = InvalidationListener(CACHE_INVALIDATION_POLL_MS / 1000, CACHE_INVALIDATION_RETENTION_SECONDS)
@@ -1 +1,43 @@
- 
\ No newline at end of file
+"""
+Versioned database migrations.
+
+Every migration is a ``migrate()`` function. Its position in the list passed to
+``apply_migrations`` is its schema version, and the highest applied version is
+stored in SQLite's ``PRAGMA user_version`` so each migration runs only once.
+"""
+
+from sqlalchemy import text
+
+from app.db.base import engine
+
+# Rows sampled per index when refreshing planner statistics
+ANALYSIS_LIMIT = 1000
+
+def get_schema_version():
+    """Return the schema version recorded in the database."""
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar()
+
+def set_schema_version(version):
+    """Record the schema version in the database."""
+    with engine.begin() as conn:
+        conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+def apply_migrations(migrations):
+    """Run every migration newer than the recorded schema version, in order."""
+    current = get_schema_version()
+    for version, migrate in enumerate(migrations, start=1):
+        if version <= current:
+            continue
+        migrate()
+        set_schema_version(version)
+
+def refresh_statistics():
+    """
+    Update the query planner's statistics (sqlite_stat1). The listing queries
+    rely on them to choose between seeking a filter's index and walking the
+    sort order; ``analysis_limit`` keeps this quick on large tables.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}"))
+        conn.execute(text("ANALYZE"))
@@ -0,0 +1,16 @@
+"""
+Migration script to move the flash-sale admission queues into the database.
+"""
+
+from app.db.base import engine
+from app.models.admission import AdmissionSchedule, AdmissionTicket
+
+def migrate():
+    """Create the tables that share admission queues between worker processes."""
+    AdmissionSchedule.__table__.create(bind=engine, checkfirst=True)
+    AdmissionTicket.__table__.create(bind=engine, checkfirst=True)
+
+    print("Successfully created admission tables.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,15 @@
+"""
+Migration script to create the cache invalidation log shared by the workers.
+"""
+
+from app.db.base import engine
+from app.models.invalidation import CacheInvalidation
+
+def migrate():
+    """Create the cache_invalidations table and its index."""
+    CacheInvalidation.__table__.create(bind=engine, checkfirst=True)
+
+    print("Successfully created cache invalidation log.")
+
+if __name__ == "__main__":
+    migrate()
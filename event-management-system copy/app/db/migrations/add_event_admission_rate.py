@@ -0,0 +1,19 @@
+"""
+Migration script to add the flash-sale admission rate to events.
+"""
+
+from sqlalchemy import inspect, text
+
+from app.db.base import engine
+
+def migrate():
+    """Add the nullable admission_rate column (NULL means no admission queue)."""
+    columns = {column["name"] for column in inspect(engine).get_columns("events")}
+    if "admission_rate" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE events ADD COLUMN admission_rate INTEGER"))
+
+    print("Successfully added event admission rate.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,36 @@
+"""
+Migration script to add the attendee_count and tickets_sold counters to events.
+"""
+
+from sqlalchemy import inspect, text
+
+from app.db.base import engine, SessionLocal
+from app.db.counters import recompute_event_counters
+from app.models.order import OrderItem
+from app.models.registration import Registration
+
+def migrate():
+    """Add the counter columns and their source indexes, then fill the counters."""
+    columns = {column["name"] for column in inspect(engine).get_columns("events")}
+    with engine.begin() as conn:
+        for name in ("attendee_count", "tickets_sold"):
+            if name not in columns:
+                conn.execute(text(f"ALTER TABLE events ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+
+    # Indexes used by the counter recomputation
+    for index in list(Registration.__table__.indexes) + list(OrderItem.__table__.indexes):
+        # Unique indexes wait until duplicates are removed (add_unique_registrations)
+        if not index.unique:
+            index.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        recompute_event_counters(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print("Successfully added event counters.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,16 @@
+"""
+Migration script to add the composite indexes used by event listing filters.
+"""
+
+from app.db.base import engine
+from app.models.event import Event
+
+def migrate():
+    """Create the event filter indexes on databases that predate them."""
+    for index in Event.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    print("Successfully created event filter indexes.")
+
+if __name__ == "__main__":
+    migrate()
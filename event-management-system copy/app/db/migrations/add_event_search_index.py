@@ -0,0 +1,20 @@
+"""
+Migration script to create the full-text search index for events.
+"""
+
+from sqlalchemy import text
+
+from app.db.base import engine
+from app.db.search import CREATE_STATEMENTS, REBUILD_STATEMENT
+
+def migrate():
+    """Create the events_fts table and its sync triggers, then index existing events."""
+    with engine.begin() as conn:
+        for statement in CREATE_STATEMENTS:
+            conn.execute(text(statement))
+        conn.execute(text(REBUILD_STATEMENT))
+
+    print("Successfully created full-text search index for events.")
+
+if __name__ == "__main__":
+    migrate()
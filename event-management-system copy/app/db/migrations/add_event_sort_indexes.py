@@ -0,0 +1,20 @@
+"""
+Migration script to add the (filter, sort column) indexes of event listings.
+"""
+
+from sqlalchemy import text
+
+from app.db.base import engine
+from app.models.event import Event
+
+def migrate():
+    """Create the event sort indexes and collect planner statistics for them."""
+    for index in Event.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE events"))
+
+    print("Successfully created event sort indexes.")
+
+if __name__ == "__main__":
+    migrate()
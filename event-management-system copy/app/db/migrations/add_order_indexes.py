@@ -0,0 +1,16 @@
+"""
+Migration script to index the foreign keys used to load a user's orders and tickets.
+"""
+
+from app.db.base import engine
+from app.models.order import Order, OrderItem
+
+def migrate():
+    """Create the orders.user_id and order_items.order_id indexes on existing databases."""
+    for index in list(Order.__table__.indexes) + list(OrderItem.__table__.indexes):
+        index.create(bind=engine, checkfirst=True)
+
+    print("Successfully created order indexes.")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,18 @@
+"""
+Migration script to index registrations by event and user.
+"""
+
+from app.db.base import engine
+from app.models.registration import Registration
+
+def migrate():
+    """Create the registrations (event_id, user_id) index on existing databases."""
+    for index in Registration.__table__.indexes:
+        # Unique indexes wait until duplicates are removed (add_unique_registrations)
+        if not index.unique:
+            index.create(bind=engine, checkfirst=True)
+
+    print("Successfully created registration indexes.")
+
+if __name__ == "__main__":
+    migrate()
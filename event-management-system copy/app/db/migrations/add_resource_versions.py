@@ -0,0 +1,29 @@
+"""
+Migration script to add the version counters used for ETags.
+"""
+
+from sqlalchemy import inspect, text
+
+from app.db.base import engine
+from app.db.versions import VERSIONED_TABLES
+from app.models.version import TableVersion
+
+def migrate():
+    """Add version and updated_at to events and create the table_versions rows."""
+    columns = {column["name"] for column in inspect(engine).get_columns("events")}
+    TableVersion.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        if "version" not in columns:
+            conn.execute(text("ALTER TABLE events ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+        if "updated_at" not in columns:
+            conn.execute(text("ALTER TABLE events ADD COLUMN updated_at DATETIME"))
+        for name in VERSIONED_TABLES:
+            conn.execute(
+                text("INSERT OR IGNORE INTO table_versions (name, version) VALUES (:name, 1)"),
+                {"name": name}
+            )
+
+    print("Successfully added resource versions.")
+
+if __name__ == "__main__":
+    migrate()
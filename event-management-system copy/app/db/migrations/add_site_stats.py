@@ -0,0 +1,22 @@
+"""
+Migration script to create and fill the site_stats aggregates table.
+"""
+
+from app.db.base import engine, SessionLocal
+from app.db.stats import reconcile_stats
+from app.models.stats import SiteStats
+
+def migrate():
+    """Create the site_stats table and compute its single row."""
+    SiteStats.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        reconcile_stats(db)
+    finally:
+        db.close()
+
+    print("Successfully created site statistics.")
+
+if __name__ == "__main__":
+    migrate()
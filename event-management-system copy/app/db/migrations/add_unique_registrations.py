@@ -0,0 +1,36 @@
+"""
+Migration script to make registrations unique per event and user.
+"""
+
+from sqlalchemy import text
+
+from app.db.base import engine, SessionLocal
+from app.db.counters import recompute_event_counters
+from app.db.stats import reconcile_stats
+
+def migrate():
+    """Remove duplicate registrations and replace the (event_id, user_id) index with a unique one."""
+    with engine.begin() as conn:
+        # Keep the first registration of every user for an event
+        removed = conn.execute(text(
+            "DELETE FROM registrations WHERE id NOT IN "
+            "(SELECT MIN(id) FROM registrations GROUP BY event_id, user_id)"
+        )).rowcount
+        conn.execute(text("DROP INDEX IF EXISTS ix_registrations_event_user"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX ix_registrations_event_user ON registrations (event_id, user_id)"
+        ))
+
+    if removed:
+        db = SessionLocal()
+        try:
+            recompute_event_counters(db)
+            db.commit()
+            reconcile_stats(db)
+        finally:
+            db.close()
+
+    print(f"Successfully made registrations unique ({removed} duplicates removed).")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,47 @@
+"""
+Migration script to make the sort columns of event listings NOT NULL.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateTable
+
+from app.db.base import engine
+from app.db.search import CREATE_STATEMENTS, REBUILD_STATEMENT
+from app.models.event import Event
+
+# Value given to existing NULLs, per column
+FILL_VALUES = {
+    "title": "''",
+    "price": "0.0",
+    "start_date": "COALESCE(end_date, updated_at, CURRENT_TIMESTAMP)",
+}
+
+def migrate():
+    """Fill NULL titles, prices and start dates and rebuild the events table with NOT NULL columns."""
+    with engine.begin() as conn:
+        columns = {row.name: row for row in conn.execute(text("PRAGMA table_info(events)"))}
+        if all(columns[name].notnull for name in FILL_VALUES):
+            print("Event sort columns are already NOT NULL.")
+            return
+
+        for name, value in FILL_VALUES.items():
+            conn.execute(text(f"UPDATE events SET {name} = {value} WHERE {name} IS NULL"))
+
+        # SQLite cannot alter a column: copy the rows into a table created from
+        # the model, then swap it in and restore its indexes and search triggers
+        create = str(CreateTable(Event.__table__).compile(conn))
+        conn.execute(text(create.replace("CREATE TABLE events ", "CREATE TABLE events_new ", 1)))
+        names = ", ".join(name for name in Event.__table__.columns.keys() if name in columns)
+        conn.execute(text(f"INSERT INTO events_new ({names}) SELECT {names} FROM events"))
+        conn.execute(text("DROP TABLE events"))
+        conn.execute(text("ALTER TABLE events_new RENAME TO events"))
+        for index in Event.__table__.indexes:
+            index.create(bind=conn)
+        for statement in CREATE_STATEMENTS:
+            conn.execute(text(statement))
+        conn.execute(text(REBUILD_STATEMENT))
+
+    print("Successfully made event sort columns NOT NULL.")
+
+if __name__ == "__main__":
+    migrate()
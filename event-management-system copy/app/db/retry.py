@@ -0,0 +1,54 @@
+"""
+Retrying write transactions that lose the race for SQLite's write lock.
+
+SQLite allows one writer at a time. ``busy_timeout`` makes most writers wait
+for the lock, but some conflicts are reported immediately as "database is
+locked" (for instance when a transaction that has already read must be
+upgraded to a writer after another connection committed). Such a transaction
+can only be rolled back and run again, which ``run_with_retry`` does with
+jittered exponential backoff so that colliding writers spread out.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import DB_LOCK_BACKOFF_SECONDS, DB_LOCK_RETRIES
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class DatabaseBusy(Exception):
+    """Raised when a write transaction still hit a locked database after every retry."""
+
+def is_lock_error(exc: OperationalError) -> bool:
+    message = str(exc.orig).lower()
+    return "database is locked" in message or "database is busy" in message
+
+async def run_with_retry(
+    db: AsyncSession,
+    work: Callable[[], Awaitable[T]],
+    attempts: int = DB_LOCK_RETRIES,
+    backoff: float = DB_LOCK_BACKOFF_SECONDS,
+) -> T:
+    """
+    Run ``work`` (which must commit its own transaction), rolling back and
+    starting over when it fails on a locked database.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await work()
+        except OperationalError as exc:
+            await db.rollback()
+            if not is_lock_error(exc):
+                raise
+            if attempt == attempts:
+                raise DatabaseBusy() from exc
+            delay = backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            logger.warning("Database is locked, retrying in %.3fs (attempt %d of %d)", delay, attempt, attempts)
+            await asyncio.sleep(delay)
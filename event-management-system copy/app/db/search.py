@@ -0,0 +1,75 @@
+"""
+Full-text search over events.
+
+Events are indexed in an SQLite FTS5 virtual table (``events_fts``) that uses the
+``events`` table as external content. Triggers keep the index in sync on insert,
+update and delete, so the ORM never has to touch it directly.
+"""
+
+import re
+
+from sqlalchemy import Integer, column, func, literal_column, table
+
+# Column weights for bm25 ranking: title, description, location
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+LOCATION_WEIGHT = 5.0
+
+CREATE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, description, location,
+        content='events', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_au
+    AFTER UPDATE OF title, description, location ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END
+    """,
+]
+
+REBUILD_STATEMENT = "INSERT INTO events_fts(events_fts) VALUES ('rebuild')"
+
+# Lightweight handle on the virtual table for use in ORM queries
+events_fts = table("events_fts", column("rowid", Integer))
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def build_match_query(term: str):
+    """
+    Turn free user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix query, so ``"tech conf"`` matches events
+    containing words starting with both "tech" and "conf". Returns None when the
+    input contains no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(term or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def match_events(match_query: str):
+    """Where clause selecting index rows that match an FTS5 expression."""
+    return literal_column("events_fts").op("MATCH")(match_query)
+
+def search_rank():
+    """bm25 relevance of the current match; lower values rank higher."""
+    return func.bm25(literal_column("events_fts"), TITLE_WEIGHT, DESCRIPTION_WEIGHT, LOCATION_WEIGHT)
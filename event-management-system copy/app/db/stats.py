@@ -0,0 +1,106 @@
+"""
+Site-wide aggregates for the admin dashboard.
+
+The totals live in a single ``site_stats`` row. Writers adjust it with a
+relative UPDATE in the same transaction as the change they make, so the
+dashboard reads one row instead of counting whole tables. "Upcoming" events
+also change with the passage of time, which no write observes, so a
+reconciliation on startup and then periodically recomputes every aggregate
+from the source tables and corrects any drift.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.base import SessionLocal
+from app.models.event import Event
+from app.models.order import Order, OrderItem
+from app.models.registration import Registration
+from app.models.stats import SiteStats
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Primary key of the single aggregates row
+STATS_ROW_ID = 1
+
+async def adjust_stats(db: AsyncSession, **deltas):
+    """Add each keyword's delta to the matching aggregate column."""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    values = {name: getattr(SiteStats, name) + delta for name, delta in deltas.items()}
+    await db.execute(
+        update(SiteStats)
+        .where(SiteStats.id == STATS_ROW_ID)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+def user_status_deltas(is_active: bool, sign: int = 1) -> dict:
+    """Aggregate deltas for adding (sign=1) or removing (sign=-1) a user."""
+    if is_active:
+        return {"total_users": sign, "active_users": sign}
+    return {"total_users": sign, "pending_users": sign}
+
+def is_upcoming(start_date) -> bool:
+    return start_date is not None and start_date > datetime.utcnow()
+
+def _count(model, *criteria):
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+def reconcile_stats(db: Session):
+    """
+    Recompute every aggregate from the source tables and store the result.
+
+    The counts are subqueries of a single UPDATE, so they are read under the
+    write lock and no concurrent ``adjust_stats`` can slip in between the
+    count and the write and be lost.
+    """
+    now = datetime.utcnow()
+    total_users = _count(User)
+    active_users = _count(User, User.is_active == True)
+    values = {
+        "total_users": total_users,
+        "active_users": active_users,
+        "pending_users": total_users - active_users,
+        "total_events": _count(Event),
+        "upcoming_events": _count(Event, Event.start_date > now),
+        "total_registrations": _count(Registration),
+        "total_orders": _count(Order),
+        "tickets_sold": select(func.coalesce(func.sum(OrderItem.quantity), 0)).scalar_subquery(),
+        "total_revenue": select(func.coalesce(func.sum(OrderItem.price * OrderItem.quantity), 0.0)).scalar_subquery(),
+        "reconciled_at": now,
+    }
+    reconcile = (
+        update(SiteStats)
+        .where(SiteStats.id == STATS_ROW_ID)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if not db.execute(reconcile).rowcount:
+        db.add(SiteStats(id=STATS_ROW_ID))
+        db.flush()
+        db.execute(reconcile)
+    db.commit()
+
+def _reconcile_once():
+    db = SessionLocal()
+    try:
+        reconcile_stats(db)
+    finally:
+        db.close()
+
+async def run_stats_reconciliation(interval: float):
+    """Background task: reconcile the aggregates on startup and every ``interval`` seconds."""
+    while True:
+        try:
+            await asyncio.to_thread(_reconcile_once)
+        except Exception:
+            logger.exception("Stats reconciliation failed")
+        await asyncio.sleep(interval)
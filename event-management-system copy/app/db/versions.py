@@ -0,0 +1,87 @@
+"""
+Version counters for conditional GETs.
+
+Every write to events, categories or users bumps that table's row in
+``table_versions`` within its own transaction, and every write to an event
+also bumps ``Event.version``. ETags are built from these numbers, so a client's
+cached copy can be validated without loading or serializing the resource.
+
+Table versions are kept in a small in-process cache. Bumping a version
+publishes an invalidation for it (see ``app.db.invalidation``), which drops
+the cached entry in the writing worker on commit and in the other workers at
+their next poll of the invalidation log.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import TABLE_VERSION_CACHE_TTL_SECONDS
+from app.db.invalidation import Invalidation, publish_invalidations, register_channel
+from app.models.version import TableVersion
+
+VERSIONED_TABLES = ("events", "categories", "users")
+
+version_cache = TTLCache(len(VERSIONED_TABLES), TABLE_VERSION_CACHE_TTL_SECONDS)
+
+# Bumped on every invalidation, so a read that raced with a write cannot put
+# the version it loaded before the write back into the cache
+_invalidations = 0
+_invalidations_lock = threading.Lock()
+
+async def bump_table_versions(db: AsyncSession, *names: str):
+    """Advance the version of each named table; call in the writing transaction."""
+    await db.execute(
+        update(TableVersion)
+        .where(TableVersion.name.in_(names))
+        .values(version=TableVersion.version + 1, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await publish_invalidations(db, *(Invalidation("table_versions", name) for name in names))
+
+def invalidate_table_versions(*names: str):
+    """Drop cached versions of the named tables."""
+    global _invalidations
+    with _invalidations_lock:
+        _invalidations += 1
+        for name in names:
+            version_cache.delete(name)
+
+def clear_table_versions():
+    """Drop every cached version."""
+    global _invalidations
+    with _invalidations_lock:
+        _invalidations += 1
+        version_cache.clear()
+
+register_channel("table_versions", lambda name, item_id: invalidate_table_versions(name), clear_table_versions)
+
+async def get_table_versions(db: AsyncSession, *names: str) -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """Current ``(version, updated_at)`` of each named table, from the cache when possible."""
+    versions = {}
+    missing = []
+    for name in names:
+        cached = version_cache.get(name)
+        if cached is None:
+            missing.append(name)
+        else:
+            versions[name] = cached
+
+    if missing:
+        seen = _invalidations
+        rows = (await db.execute(
+            select(TableVersion.name, TableVersion.version, TableVersion.updated_at)
+            .where(TableVersion.name.in_(missing))
+        )).all()
+        with _invalidations_lock:
+            for row in rows:
+                versions[row.name] = (row.version, row.updated_at)
+                if seen == _invalidations:
+                    version_cache.set(row.name, versions[row.name])
+    for name in names:
+        versions.setdefault(name, (0, None))
+    return versions
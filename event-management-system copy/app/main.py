@@ -1,13 +1,46 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.api import api_router
-from app.db.base import engine, Base
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.config import STATS_RECONCILE_INTERVAL_SECONDS
+from app.core.logging_setup import setup_logging
+from app.core.security import hashing_pool
+from app.db import check_migrations
+from app.db.checkins import checkin_buffer
+from app.db.invalidation import invalidation_listener
+from app.db.retry import DatabaseBusy
+from app.db.stats import run_stats_reconciliation
+
+# Log through the background writer thread from the start
+setup_logging()
 
-# Create all tables in the database
-Base.metadata.create_all(bind=engine)
+# Migrations run once before the workers start (run.py, run_migrations.py);
+# a worker only checks that they have been applied
+check_migrations()
 
-app = FastAPI(title="Event Management System API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start background jobs, after recovering check-ins logged before a crash
+    checkin_buffer.replay()
+    await invalidation_listener.poll()
+    reconciliation = asyncio.create_task(run_stats_reconciliation(STATS_RECONCILE_INTERVAL_SECONDS))
+    checkin_flusher = asyncio.create_task(checkin_buffer.run())
+    invalidation_poller = asyncio.create_task(invalidation_listener.run())
+    yield
+    # Stop background jobs and workers on shutdown
+    reconciliation.cancel()
+    invalidation_poller.cancel()
+    checkin_flusher.cancel()
+    await asyncio.gather(checkin_flusher, return_exceptions=True)
+    await checkin_buffer.close()
+    hashing_pool.shutdown()
+
+app = FastAPI(title="Event Management System API", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -16,8 +49,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Writes that kept finding the database locked are worth retrying later
+@app.exception_handler(DatabaseBusy)
+async def database_busy_handler(request: Request, exc: DatabaseBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 # Include API router
 app.include_router(api_router, prefix="/api")
 
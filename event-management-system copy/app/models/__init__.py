@@ -2,4 +2,8 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.event import Event
 from app.models.registration import Registration
-from app.models.order import Order, OrderItem 
\ No newline at end of file
+from app.models.order import Order, OrderItem
+from app.models.stats import SiteStats
+from app.models.version import TableVersion
+from app.models.invalidation import CacheInvalidation
+from app.models.admission import AdmissionSchedule, AdmissionTicket
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Float, Index
+
+from app.db.base import Base
+
+class AdmissionSchedule(Base):
+    """Admission state of one flash-sale event's queue, shared by every worker."""
+    __tablename__ = "admission_schedules"
+    
+    event_id = Column(Integer, primary_key=True)
+    rate = Column(Integer, nullable=False)
+    last_position = Column(Integer, nullable=False, default=0)
+    # Theoretical admission time (epoch seconds) of the next buyer to join
+    next_admission_at = Column(Float, nullable=False, default=0.0)
+    completed = Column(Integer, nullable=False, default=0)
+
+class AdmissionTicket(Base):
+    """A buyer's place in a flash-sale queue, deleted when it is spent on a checkout."""
+    __tablename__ = "admission_tickets"
+    __table_args__ = (
+        # One live ticket per buyer and event
+        Index("ix_admission_tickets_event_user", "event_id", "user_id", unique=True),
+        Index("ix_admission_tickets_event_expires", "event_id", "expires_at"),
+    )
+    
+    token = Column(String, primary_key=True)
+    event_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    position = Column(Integer, nullable=False)
+    # Epoch seconds: checkout opens at admitted_at and closes at expires_at
+    admitted_at = Column(Float, nullable=False)
+    expires_at = Column(Float, nullable=False)
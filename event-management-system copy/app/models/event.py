@@ -1,20 +1,50 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from datetime import datetime
 
 from app.db.base import Base
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Composite indexes matching the filter combinations of event listings:
+        # the equality filter first and the sort column last, so a filtered
+        # listing is read in order and stops at its limit. The id sort uses the
+        # rowid every index ends with.
+        Index("ix_events_category_start", "category_id", "start_date"),
+        Index("ix_events_category_price", "category_id", "price"),
+        Index("ix_events_category_title", "category_id", "title"),
+        Index("ix_events_category", "category_id"),
+        Index("ix_events_organizer_start", "organizer_id", "start_date"),
+        Index("ix_events_organizer_price", "organizer_id", "price"),
+        Index("ix_events_organizer_title", "organizer_id", "title"),
+        Index("ix_events_organizer", "organizer_id"),
+        Index("ix_events_start_date", "start_date"),
+        Index("ix_events_end_date", "end_date"),
+        Index("ix_events_price", "price"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    # Sort columns of event listings are NOT NULL, so keyset pages seek on
+    # (column, id) alone (see app.core.pagination)
+    title = Column(String, index=True, nullable=False)
     description = Column(Text)
-    start_date = Column(DateTime)
+    start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime)
     location = Column(String)
     capacity = Column(Integer, nullable=True)
-    price = Column(Float, default=0.0)
+    price = Column(Float, nullable=False, default=0.0)
     is_published = Column(Boolean, default=True)
+    # Buyers admitted to checkout per second during a flash sale (NULL: no queue)
+    admission_rate = Column(Integer, nullable=True)
+    
+    # Denormalized counters, maintained by app.db.counters
+    attendee_count = Column(Integer, nullable=False, default=0, server_default="0")
+    tickets_sold = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    # Bumped by every write to the event (counters included), for ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime, nullable=True, default=datetime.utcnow)
     
     organizer_id = Column(Integer, ForeignKey("users.id"))
     category_id = Column(Integer, ForeignKey("categories.id"))
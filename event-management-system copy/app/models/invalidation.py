@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.db.base import Base
+
+class CacheInvalidation(Base):
+    """Change log of cache invalidations, polled by every worker process."""
+    __tablename__ = "cache_invalidations"
+    # Never reuse an ID, even after the log has been pruned
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True)
+    channel = Column(String, nullable=False)
+    name = Column(String, nullable=True)
+    item_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,9 +6,13 @@ from app.db.base import Base
 
 class Registration(Base):
     __tablename__ = "registrations"
+    __table_args__ = (
+        # One registration per user and event, enforced by the database
+        Index("ix_registrations_event_user", "event_id", "user_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    event_id = Column(Integer, ForeignKey("events.id"))
+    event_id = Column(Integer, ForeignKey("events.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     registration_date = Column(DateTime, default=datetime.utcnow)
     ticket_id = Column(String, unique=True, index=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, DateTime
+
+from app.db.base import Base
+
+class SiteStats(Base):
+    """Single-row table of site-wide aggregates for the admin dashboard."""
+    __tablename__ = "site_stats"
+    
+    id = Column(Integer, primary_key=True)
+    total_users = Column(Integer, nullable=False, default=0, server_default="0")
+    active_users = Column(Integer, nullable=False, default=0, server_default="0")
+    pending_users = Column(Integer, nullable=False, default=0, server_default="0")
+    total_events = Column(Integer, nullable=False, default=0, server_default="0")
+    upcoming_events = Column(Integer, nullable=False, default=0, server_default="0")
+    total_registrations = Column(Integer, nullable=False, default=0, server_default="0")
+    total_orders = Column(Integer, nullable=False, default=0, server_default="0")
+    tickets_sold = Column(Integer, nullable=False, default=0, server_default="0")
+    total_revenue = Column(Float, nullable=False, default=0.0, server_default="0")
+    reconciled_at = Column(DateTime, nullable=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+
+from app.db.base import Base
+
+class TableVersion(Base):
+    """Change counter per table, bumped by every write; used to build listing ETags."""
+    __tablename__ = "table_versions"
+    
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime, nullable=True)
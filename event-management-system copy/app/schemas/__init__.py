@@ -2,5 +2,5 @@ from app.schemas.token import Token, TokenData
 from app.schemas.user import UserBase, UserCreate, UserUpdate, UserResponse, UserInDB
 from app.schemas.category import CategoryBase, CategoryCreate, CategoryUpdate, CategoryResponse
 from app.schemas.event import EventBase, EventCreate, EventUpdate, EventResponse, EventDetailResponse
-from app.schemas.registration import RegistrationCreate, RegistrationResponse, TicketResponse
+from app.schemas.registration import RegistrationCreate, RegistrationResponse, AttendeeResponse, TicketResponse
 from app.schemas.order import Order, OrderCreate, OrderItem, OrderItemCreate 
\ No newline at end of file
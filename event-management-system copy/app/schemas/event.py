@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+from datetime import date, datetime
 
 from app.schemas.user import UserResponse
 from app.schemas.category import CategoryResponse
@@ -14,6 +14,7 @@ class EventBase(BaseModel):
     capacity: Optional[int] = None
     price: float = 0.0
     is_published: bool = True
+    admission_rate: Optional[int] = Field(None, gt=0)
     category_id: int
 
 class EventCreate(EventBase):
@@ -36,6 +37,7 @@ class EventUpdate(BaseModel):
     capacity: Optional[int] = None
     price: Optional[float] = None
     is_published: Optional[bool] = None
+    admission_rate: Optional[int] = Field(None, gt=0)
     category_id: Optional[int] = None
     
     # Additional fields that may come from the frontend
@@ -63,5 +65,37 @@ class EventDetailResponse(EventResponse):
     category: CategoryResponse
     organizer: UserResponse
     attendee_count: int
+    tickets_sold: int
     
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class EventBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+
+class EventBatchResponse(BaseModel):
+    events: List[EventDetailResponse]
+    missing: List[int]
+
+class CategoryFacet(BaseModel):
+    category_id: Optional[int] = None
+    count: int
+
+class PriceBucket(BaseModel):
+    low: float
+    high: float
+    count: int
+
+class PriceFacet(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    histogram: List[PriceBucket]
+
+class WeekFacet(BaseModel):
+    week_start: date
+    count: int
+
+class EventFacetsResponse(BaseModel):
+    total: int
+    categories: List[CategoryFacet]
+    price: PriceFacet
+    upcoming_weeks: List[WeekFacet]
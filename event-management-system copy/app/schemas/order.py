@@ -1,12 +1,13 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 # OrderItem schemas
 class OrderItemBase(BaseModel):
     eventId: int
-    quantity: int
-    price: float
+    quantity: int = Field(..., gt=0)
+    # Ignored on create: items are priced from the event on the server
+    price: Optional[float] = None
 
 class OrderItemCreate(OrderItemBase):
     pass
@@ -18,10 +19,7 @@ class OrderItem(BaseModel):
     quantity: int
     price: float
 
-    class Config:
-        orm_mode = True
-        populate_by_name = True
-        allow_population_by_field_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 # Customer info schema
 class CustomerInfo(BaseModel):
@@ -39,7 +37,10 @@ class OrderBase(BaseModel):
 class OrderCreate(OrderBase):
     items: List[OrderItemCreate]
     customer: CustomerInfo
-    total: float
+    # Ignored: the total is computed on the server
+    total: Optional[float] = None
+    # Admission token from the event's queue, required during a flash sale
+    queueToken: Optional[str] = None
 
 class Order(OrderBase):
     id: int
@@ -50,5 +51,4 @@ class Order(OrderBase):
     customer_info: Dict[str, Any]
     items: List[OrderItem]
 
-    class Config:
-        orm_mode = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
@@ -1,9 +1,9 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 from datetime import datetime
 
 from app.schemas.event import EventResponse
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, UserShort
 
 class RegistrationCreate(BaseModel):
     event_id: int
@@ -19,6 +19,37 @@ class RegistrationResponse(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class AttendeeResponse(BaseModel):
+    id: int
+    ticket_id: str
+    registration_date: datetime
+    checked_in: bool
+    checked_in_time: Optional[datetime] = None
+    user: UserShort
+
+class ScannerKeyResponse(BaseModel):
+    event_id: int
+    key: str
+    algorithm: str
+
+class ScanLogEntry(BaseModel):
+    code: str
+    scanned_at: datetime
+    device_id: Optional[str] = None
+
+class ScanSyncRequest(BaseModel):
+    scans: List[ScanLogEntry] = Field(..., max_length=5000)
+
+class RejectedScan(BaseModel):
+    code: str
+    reason: str
+
+class ScanSyncResponse(BaseModel):
+    received: int
+    checked_in: int
+    duplicates: int
+    rejected: List[RejectedScan]
+
 class TicketResponse(RegistrationResponse):
     event: EventResponse
     user: UserResponse
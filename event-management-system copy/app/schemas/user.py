@@ -34,8 +34,7 @@ class UserShort(BaseModel):
     name: str
     email: EmailStr
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
         
 # Schema for password change
 class PasswordChange(BaseModel):
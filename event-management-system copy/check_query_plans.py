@@ -0,0 +1,142 @@
+"""
+Script to verify that every event listing filter combination is index-backed.
+
+Builds the same queries as GET /api/events for each combination of filters and
+sort order, for the first page and for a page resumed from a cursor, against
+an in-memory copy of the schema filled with a synthetic, realistically
+distributed set of events. After ANALYZE the planner works from
+the same kind of statistics as in production (see ``refresh_statistics``), so
+no selectivity hints are needed.
+
+A plan is rejected when it scans the events table (or one of its indexes)
+instead of searching it, unless it is on the allow-list below. The script
+exits with a non-zero status if any plan is rejected.
+
+Allowed: the first page of a listing filtered only by ranges (dates, prices)
+and sorted by another column. No single index serves both a range and a
+different order, so the planner walks the sort order and skips rows outside
+the range; it stops at the page limit without sorting, and resumed pages seek
+from the cursor.
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from itertools import combinations
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.dialects import sqlite
+
+# Import all models first so the schema is complete
+from app.models import Event
+from app.db.base import Base
+from app.db.search import CREATE_STATEMENTS
+from app.api.endpoints.events import EVENT_SORT_FIELDS, apply_event_filters
+from app.core.pagination import encode_cursor, keyset
+
+# One sample value per filter accepted by GET /api/events
+SAMPLE_FILTERS = {
+    "category_id": 1,
+    "start_date": datetime(2030, 1, 1),
+    "end_date": datetime(2030, 12, 31),
+    "price_min": 10.0,
+    "price_max": 100.0,
+    "organizer_id": 1,
+    "search": "conference",
+}
+
+# Filters that bound a column by a range rather than an equality, with that column
+RANGE_FILTERS = {"start_date": "start_date", "end_date": "end_date", "price_min": "price", "price_max": "price"}
+
+# Sort value a page can end on, per sort field (an id cursor carries the id alone)
+SAMPLE_CURSOR_VALUES = {
+    "start_date": datetime(2030, 6, 1),
+    "price": 50.0,
+    "title": "Event 5000",
+    "id": None,
+}
+
+# Shape of the synthetic data the statistics are collected from
+SAMPLE_EVENTS = 20000
+SAMPLE_CATEGORIES = 20
+SAMPLE_ORGANIZERS = 500
+
+def sample_events(count: int):
+    rng = random.Random(0)
+    first_day = datetime(2029, 1, 1)
+    for number in range(count):
+        start = first_day + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        yield {
+            "title": f"Event {number}",
+            "description": rng.choice(["conference talks", "workshop", "meetup", "party"]),
+            "location": "City",
+            "start_date": start,
+            "end_date": start + timedelta(days=rng.randint(1, 3)),
+            "price": 0.0 if rng.random() < 0.2 else round(rng.uniform(5, 500), 2),
+            "category_id": rng.randint(1, SAMPLE_CATEGORIES),
+            "organizer_id": rng.randint(1, SAMPLE_ORGANIZERS),
+            "is_published": True,
+            "attendee_count": 0,
+            "tickets_sold": 0,
+            "version": 1,
+        }
+
+def explain(conn, query):
+    compiled = query.compile(dialect=sqlite.dialect())
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).fetchall()
+    return [row[-1] for row in rows]
+
+def is_full_scan(plan):
+    # "SCAN events" reads rows in table or index order rather than seeking to
+    # the matching ones; a SEARCH (or a scan of the FTS index) does not
+    return any(detail.startswith("SCAN events") and not detail.startswith("SCAN events_fts") for detail in plan)
+
+def is_allowed_scan(names, sort, cursor, plan):
+    # A first page filtered only by ranges on other columns than the sort may
+    # walk the sort order, as long as it does not sort the rows it reads
+    if cursor is not None or not set(names) <= set(RANGE_FILTERS):
+        return False
+    if sort.lstrip("-") in {RANGE_FILTERS[name] for name in names}:
+        return False
+    return not any("TEMP B-TREE FOR ORDER BY" in detail for detail in plan)
+
+def main():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    failures = 0
+    allowed = 0
+    checked = 0
+    with engine.connect() as conn:
+        for statement in CREATE_STATEMENTS:
+            conn.execute(text(statement))
+        conn.execute(insert(Event), list(sample_events(SAMPLE_EVENTS)))
+        conn.execute(text("ANALYZE"))
+
+        for size in range(1, len(SAMPLE_FILTERS) + 1):
+            for names in combinations(SAMPLE_FILTERS, size):
+                filters = {name: SAMPLE_FILTERS[name] for name in names}
+                for sort in [prefix + name for name in EVENT_SORT_FIELDS for prefix in ("", "-")]:
+                    value = SAMPLE_CURSOR_VALUES[sort.lstrip("-")]
+                    resume = encode_cursor(sort, [1000] if value is None else [value, 1000])
+                    for cursor in (None, resume):
+                        page = keyset(sort, cursor, EVENT_SORT_FIELDS, Event.id)
+                        query = page.apply(apply_event_filters(select(Event), **filters)).limit(100)
+                        plan = explain(conn, query)
+                        checked += 1
+                        if not is_full_scan(plan):
+                            continue
+                        if is_allowed_scan(names, sort, cursor, plan):
+                            allowed += 1
+                        else:
+                            failures += 1
+                            print(f"FULL SCAN: filters={', '.join(names)} sort={sort} cursor={page.after}")
+                            for detail in plan:
+                                print(f"    {detail}")
+
+    print(f"Checked {checked} query plans, {failures} full scan(s), {allowed} allowed range scan(s).")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
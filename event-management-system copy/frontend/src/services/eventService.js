@@ -29,11 +29,27 @@ export const eventService = {
     return response.data;
   },
   
+  // Counts for the filter panel, over the events matching the given filters
+  getEventFacets: async (filters = {}) => {
+    let queryParams = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') queryParams.append(key, value);
+    });
+    const response = await api.get(`/api/events/facets?${queryParams.toString()}`);
+    return response.data;
+  },
+  
   getEvent: async (id) => {
     const response = await api.get(`/api/events/${id}`);
     return response.data;
   },
   
+  // Details of several events in one request; unknown IDs come back in `missing`
+  getEventsByIds: async (ids) => {
+    const response = await api.post('/api/events/batch', { ids });
+    return response.data;
+  },
+  
   createEvent: async (eventData) => {
     const response = await api.post('/api/events', eventData);
     return response.data;
@@ -0,0 +1,26 @@
+"""
+Script to recompute the denormalized event counters (attendee_count, tickets_sold).
+"""
+
+# Import all models first
+from app.models import User, Category, Event, Registration, Order, OrderItem
+
+# Then import db components
+from app.db.base import SessionLocal
+from app.db.counters import recompute_event_counters
+
+def repair_counters():
+    db = SessionLocal()
+    try:
+        updated = recompute_event_counters(db)
+        db.commit()
+        print(f"Recomputed counters for {updated} events.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error repairing counters: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    repair_counters()
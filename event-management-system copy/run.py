@@ -1,4 +1,8 @@
 import uvicorn
 
+from run_migrations import migrate_database
+
 if __name__ == "__main__":
+    # Migrate once here, before the server (or any of its workers) starts
+    migrate_database()
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
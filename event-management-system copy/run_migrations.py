@@ -1,43 +1,21 @@
 """
-Script to run all database migrations.
+Script to create the database schema and apply pending migrations.
+
+Run it once before starting the server workers (run.py does so itself). The
+workers only check the schema version, so several of them never migrate the
+same database at the same time.
 """
 
-import sqlite3
+# Import all models first so every table is created
+import app.models  # noqa: F401
+
+from app.db import run_migrations
+from app.db.base import Base, engine
 
-def run_migrations():
-    conn = sqlite3.connect('event_management.db')
-    cursor = conn.cursor()
-    
-    # Create orders table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS orders (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        total REAL NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        customer_info TEXT,
-        status TEXT DEFAULT 'completed',
-        FOREIGN KEY (user_id) REFERENCES users (id)
-    )
-    ''')
-    
-    # Create order_items table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS order_items (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        order_id INTEGER NOT NULL,
-        event_id INTEGER NOT NULL,
-        quantity INTEGER NOT NULL,
-        price REAL NOT NULL,
-        FOREIGN KEY (order_id) REFERENCES orders (id),
-        FOREIGN KEY (event_id) REFERENCES events (id)
-    )
-    ''')
-    
-    conn.commit()
-    conn.close()
-    
+def migrate_database():
+    Base.metadata.create_all(bind=engine)
+    run_migrations()
     print("Migrations completed successfully!")
 
 if __name__ == "__main__":
-    run_migrations() 
\ No newline at end of file
+    migrate_database()
@@ -11,7 +11,7 @@ from app.models.order import Order
 
 # Then import db components
 from app.db.base import SessionLocal, engine, Base
-from app.core.security import get_password_hash
+from app.core.hashing import hash_password as get_password_hash
 
 # Create all database tables
 Base.metadata.create_all(bind=engine)
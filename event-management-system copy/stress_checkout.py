@@ -0,0 +1,141 @@
+"""
+Script to stress test ticket checkout under concurrency.
+
+Creates a throwaway database holding one event, then lets many threads buy
+tickets for it at the same time through the create_order endpoint. Each thread
+has its own event loop and connection pool, like a separate server worker. At
+the end it checks that no more tickets were sold than the event's capacity and
+that every order either succeeded or was refused because the event sold out,
+and exits with a non-zero status otherwise.
+
+Usage: python stress_checkout.py [--threads 16] [--orders 25] [--capacity 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+# Point the app at a throwaway database before anything imports it
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(), "stress.db")
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# Import all models first
+from app.models import User, Category, Event, Registration, Order, OrderItem
+
+# Then import db components
+from app.db import run_migrations
+from app.db.base import Base, SessionLocal, create_async_db_engine, engine
+from app.api.endpoints.orders import create_order
+from app.core.hashing import hash_password
+from app.schemas.order import OrderCreate
+from app.schemas.user import UserResponse
+
+def create_fixtures(capacity: int):
+    Base.metadata.create_all(bind=engine)
+    run_migrations()
+    db = SessionLocal()
+    try:
+        user = User(email="buyer@example.com", name="Buyer", hashed_password=hash_password("stress"), is_active=True)
+        start_date = datetime.utcnow() + timedelta(days=30)
+        event = Event(
+            title="Flash sale",
+            start_date=start_date,
+            end_date=start_date + timedelta(hours=2),
+            location="Online",
+            capacity=capacity,
+            price=10.0,
+        )
+        db.add_all([user, event])
+        db.commit()
+        return UserResponse.model_validate(user), event.id
+    finally:
+        db.close()
+
+def buyer(user: UserResponse, event_id: int, orders: int, outcomes: Counter, latencies: list, lock: threading.Lock):
+    async def run():
+        db_engine = create_async_db_engine()
+        sessions = async_sessionmaker(bind=db_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        for _ in range(orders):
+            order = OrderCreate(
+                items=[{"eventId": event_id, "quantity": random.randint(1, 3)}],
+                customer={"name": user.name, "email": user.email},
+            )
+            started = time.perf_counter()
+            async with sessions() as db:
+                try:
+                    await create_order(order, db=db, current_user=user)
+                    outcome = "sold"
+                except HTTPException as exc:
+                    outcome = "sold out" if exc.status_code == 409 else f"HTTP {exc.status_code}"
+                except Exception as exc:
+                    outcome = type(exc).__name__
+            with lock:
+                outcomes[outcome] += 1
+                latencies.append(time.perf_counter() - started)
+        await db_engine.dispose()
+
+    asyncio.run(run())
+
+def stress_checkout(threads: int, orders: int, capacity: int) -> bool:
+    user, event_id = create_fixtures(capacity)
+    # The endpoints log every request at debug level
+    logging.getLogger().setLevel(logging.WARNING)
+
+    outcomes, latencies, lock = Counter(), [], threading.Lock()
+    workers = [
+        threading.Thread(target=buyer, args=(user, event_id, orders, outcomes, latencies, lock))
+        for _ in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        counter = db.execute(select(Event.tickets_sold).where(Event.id == event_id)).scalar_one()
+        sold = db.execute(
+            select(func.coalesce(func.sum(OrderItem.quantity), 0)).where(OrderItem.event_id == event_id)
+        ).scalar_one()
+    finally:
+        db.close()
+
+    latencies.sort()
+    print(f"Orders: {sum(outcomes.values())} in {elapsed:.2f}s ({sum(outcomes.values()) / elapsed:.0f}/s)")
+    print(f"Latency: median {latencies[len(latencies) // 2] * 1000:.1f}ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms")
+    print("Outcomes: " + ", ".join(f"{name}={count}" for name, count in sorted(outcomes.items())))
+    print(f"Capacity: {capacity}, tickets sold: {sold}, tickets_sold counter: {counter}")
+
+    ok = True
+    if sold > capacity:
+        print(f"FAIL: oversold by {sold - capacity} tickets")
+        ok = False
+    if counter != sold:
+        print("FAIL: tickets_sold counter does not match the order items")
+        ok = False
+    errors = {name: count for name, count in outcomes.items() if name not in ("sold", "sold out")}
+    if errors:
+        print(f"FAIL: orders failed with {errors}")
+        ok = False
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--orders", type=int, default=25, help="orders per thread")
+    parser.add_argument("--capacity", type=int, default=200)
+    args = parser.parse_args()
+    sys.exit(0 if stress_checkout(args.threads, args.orders, args.capacity) else 1)